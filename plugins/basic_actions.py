@@ -3,6 +3,7 @@ ScriptRunner 的基础动作插件。
 提供常见的游戏动作，如攻击和搜索。
 """
 
+import random
 from typing import Dict, Any, List, Callable
 from src.infrastructure.plugin_interface import ActionPlugin
 from src.infrastructure.logger import get_logger
@@ -59,9 +60,8 @@ class BasicActionsPlugin(ActionPlugin):
 
         # 从配置中获取战斗属性
         combat_attributes = attack_behavior.get('combat_attributes', ['strength', 'agility', 'defense', 'health'])
-        player_attrs = {}
-        for attr in combat_attributes:
-            player_attrs[attr] = state.get_variable(attr, 0)
+        get_variable = state.get_variable
+        player_attrs = {attr: get_variable(attr, 0) for attr in combat_attributes}
 
         # 计算命中几率
         hit_chance_expr = attack_behavior.get('hit_chance', '0.5')
@@ -73,7 +73,6 @@ class BasicActionsPlugin(ActionPlugin):
         context['target'] = target_attrs
         hit_chance = ExpressionEvaluator.evaluate_expression(hit_chance_expr, context)
 
-        import random
         if random.random() < hit_chance:
             # 命中
             damage_expr = attack_behavior.get('damage', '10')
@@ -82,13 +81,14 @@ class BasicActionsPlugin(ActionPlugin):
             # 对目标造成伤害
             health_attr = attack_behavior.get('health_attribute', 'health')
             states = target_obj.get('states', [])
-            for state in states:
-                state_name = state.get('name', 'health')  # 默认使用health
+            for obj_state in states:
+                state_name = obj_state.get('name', 'health')  # 默认使用health
                 if state_name == health_attr:
-                    old_value = state['value']
-                    state['value'] = max(0, state['value'] - damage)
+                    obj_state['value'] = max(0, obj_state['value'] - damage)
+                    # 对象状态被就地修改，使依赖对象状态的条件缓存失效
+                    state.mark_changed()
                     # 添加设置变量的动作
-                    actions.append(f"parse_and_set:{target}_{health_attr}={state['value']}")
+                    actions.append(f"parse_and_set:{target}_{health_attr}={obj_state['value']}")
                     break
 
             # 成功消息
@@ -111,7 +111,7 @@ class BasicActionsPlugin(ActionPlugin):
             # 从配置中获取反击伤害，默认 5
             counter_damage = attack_behavior.get('counter_damage', 5)
             player_health_attr = attack_behavior.get('player_health_attribute', 'health')
-            player_health = state.get_variable(player_health_attr, 100)
+            player_health = get_variable(player_health_attr, 100)
             state.set_variable(player_health_attr, max(0, player_health - counter_damage))
             counter_damage_msg = attack_behavior.get('counter_damage_msg', '你受到了{counter_damage}点反击伤害！')
             counter_damage_msg = counter_damage_msg.replace('{counter_damage}', str(counter_damage))
@@ -169,7 +169,6 @@ class BasicActionsPlugin(ActionPlugin):
         else:
             return {'success': False, 'message': f"随机表 {table_name} 格式错误", 'actions': []}
 
-        import random
         # 随机选择条目
         result = random.choice(entries)
         logger.debug(f"Rolled table {table_name}: {result}")
@@ -4,12 +4,31 @@ ScriptRunner 的核心动作插件。
 """
 
 import ast
+import re
 from typing import Dict, Any, List, Callable
 from src.infrastructure.plugin_interface import ActionPlugin
 from src.infrastructure.logger import get_logger
+from src.utils.expression_evaluator import ExpressionEvaluator
 
 logger = get_logger(__name__)
 
+# 设置表达式: key = value，按第一个等号拆分并去除两侧空白
+_SET_PATTERN = re.compile(r'^\s*([^=]*?)\s*=\s*(.*?)\s*$', re.DOTALL)
+
+# 设置表达式的值字面量: 布尔、整数、浮点数、双引号字符串
+_VALUE_PATTERN = re.compile(
+    r'(?P<bool>(?i:true|false))|(?P<int>-?\d+)|(?P<float>-?(?:\d+\.\d*|\.\d+))|"(?P<string>.*)"',
+    re.DOTALL
+)
+
+# 值字面量类型 -> 转换函数
+_VALUE_CONVERTERS = {
+    'bool': lambda text: text.lower() == 'true',
+    'int': int,
+    'float': float,
+    'string': str,
+}
+
 
 class CoreActionsPlugin(ActionPlugin):
     """提供核心游戏动作的基础插件。"""
@@ -59,7 +78,6 @@ class CoreActionsPlugin(ActionPlugin):
         if name is not None and value is not None:
             # 如果 value 是字符串且包含变量，评估它
             if isinstance(value, str) and '{' in value and '}' in value:
-                from src.utils.expression_evaluator import ExpressionEvaluator
                 # 获取所有变量作为上下文
                 all_vars = state.get_all_variables()
                 # 添加玩家属性
@@ -70,7 +88,7 @@ class CoreActionsPlugin(ActionPlugin):
                 })
                 value = ExpressionEvaluator.evaluate_expression(value, all_vars)
             state.set_variable(name, value)
-            logger.debug(f"Set variable {name} = {value}")
+            logger.debug("Set variable %s = %s", name, value)
         return {'success': True, 'message': '', 'actions': []}
 
     def _execute_parse_and_set(self, target: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -80,25 +98,16 @@ class CoreActionsPlugin(ActionPlugin):
         condition_evaluator = context.get('condition_evaluator')
         
         expression = target
-        if '=' not in expression:
+        if (match := _SET_PATTERN.match(expression)) is None:
             logger.warning(f"Invalid set expression: {expression}")
             return {'success': False, 'message': f'无效的设置表达式: {expression}', 'actions': []}
 
-        key, value_str = expression.split('=', 1)
-        key = key.strip()
-        value_str = value_str.strip()
-
-        # 解析值
-        if value_str.lower() == 'true':
-            value = True
-        elif value_str.lower() == 'false':
-            value = False
-        elif value_str.isdigit():
-            value = int(value_str)
-        elif value_str.replace('.', '').isdigit():
-            value = float(value_str)
-        elif value_str.startswith('"') and value_str.endswith('"'):
-            value = value_str[1:-1]
+        key, value_str = match[1], match[2]
+
+        # 解析值：一次匹配确定字面量类型，再按类型转换
+        if value_match := _VALUE_PATTERN.fullmatch(value_str):
+            kind = value_match.lastgroup
+            value = _VALUE_CONVERTERS[kind](value_match[kind])
         else:
             # 尝试解析为列表或其他Python字面量
             try:
@@ -107,7 +116,7 @@ class CoreActionsPlugin(ActionPlugin):
                 value = value_str
 
         state.set_variable(key, value)
-        logger.debug(f"Set variable {key} = {value}")
+        logger.debug("Set variable %s = %s", key, value)
         return {'success': True, 'message': '', 'actions': []}
 
     def _execute_set_flag(self, target: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -139,9 +139,8 @@ class PlayerActionsPlugin(ActionPlugin):
             if not obj:
                 return {'success': False, 'message': f"无法找到 {target}", 'actions': []}
 
-            # 检查是否在场景中或在库存中
-            inventory = state.get_variable('inventory', [])
-            if not (context['is_object_accessible'](target) or target in inventory):
+            # 检查是否在场景中或在库存中（对象在场景中时无需读取库存）
+            if not (context['is_object_accessible'](target) or target in state.get_variable('inventory', [])):
                 return {'success': False, 'message': f"无法检查 {target}", 'actions': []}
 
             description = obj.get('description', f"这是一个 {target}。")
@@ -167,13 +166,15 @@ class PlayerActionsPlugin(ActionPlugin):
                     return interaction_manager.start_multi_step_interaction(target)
 
             inventory = state.get_variable('inventory', [])
+            # 背包以列表保存（需可序列化），配方匹配时使用集合进行成员检查
+            owned = set(inventory)
 
-            # 从输入处理器获取组合配方
-            combine_recipes = context['input_handler'].combine_recipes
+            # 从输入处理器获取预先构建的配方原料集合
+            combine_recipes = context['input_handler'].combine_recipe_sets
 
             # 检查配方
             for result, ingredients in combine_recipes.items():
-                if all(item in inventory for item in ingredients):
+                if ingredients <= owned:
                     # 构建动作：移除原料，添加结果
                     new_inventory = [item for item in inventory if item not in ingredients] + [result]
                     actions = [f"set:inventory={new_inventory}"]
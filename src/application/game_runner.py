@@ -178,8 +178,7 @@ class GameRunner:
                 print("\n\n游戏已中断。")
                 # 尝试保存游戏状态
                 try:
-                    if self.container.has('state_manager'):
-                        state_manager = self.container.get('state_manager')
+                    if state_manager is not None:
                         state_manager.save_game()
                         self.logger.info("Game state saved successfully")
                         print("游戏状态已保存。")
@@ -21,6 +21,8 @@ from src.domain.runtime.effects_manager import EffectsManager
 from src.domain.runtime.state_machine_manager import StateMachineManager
 from src.domain.runtime.meta_manager import MetaManager
 from src.domain.runtime.random_manager import RandomManager
+from src.domain.runtime.action_executor import ActionExecutor
+from src.domain.runtime.interaction_manager import InteractionManager
 from src.presentation.ui.renderer import ConsoleRenderer
 
 
@@ -126,7 +128,6 @@ class ApplicationInitializer:
         """创建动作执行器的工厂函数。"""
         state_manager = self.container.get('state_manager')
         command_executor = self.container.get('command_executor')
-        from src.domain.runtime.action_executor import ActionExecutor
         return ActionExecutor(state_manager, command_executor)
 
     def _create_scene_executor(self):
@@ -190,7 +191,7 @@ class ApplicationInitializer:
         parser = self.container.get('parser')
         state_manager = self.container.get('state_manager')
         condition_evaluator = self.container.get('condition_evaluator')
-        return __import__('src.domain.runtime.interaction_manager', fromlist=['InteractionManager']).InteractionManager(parser, state_manager, condition_evaluator)
+        return InteractionManager(parser, state_manager, condition_evaluator)
 
     def _create_execution_engine(self):
         """创建执行引擎的工厂函数。"""
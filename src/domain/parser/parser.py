@@ -2,11 +2,19 @@
 ScriptRunner 脚本解析器，支持DSL语法和传统格式。
 """
 
+import copy
+import functools
 import yaml
 import os
 from typing import Dict, Any, List, Optional
 import re
+import sys
 from .interfaces import IScriptParser
+try:
+    # 优先使用 libyaml 提供的 C 加载器
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 try:
     from ...infrastructure.logger import get_logger
 except ImportError:
@@ -14,7 +22,43 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# 出现任一顶层键即视为DSL格式脚本
+_DSL_TOP_LEVEL_KEYS = frozenset((
+    'define_object', 'scene', 'event_system', 'command_parser',
+    'random_system', 'state_machines', 'effects',
+))
+
+# 加载时需要驻留（intern）字符串值的键：条件和动作会在运行时被反复查找
+_INTERNED_KEYS = frozenset(('condition', 'spawn_condition', 'conditions', 'actions'))
+
+# 合并字典时表示键不存在
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> tuple:
+    """解析YAML文件中的所有文档，以 (路径, 修改时间, 大小) 为键缓存结果。"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return tuple(yaml.load_all(file.read(), Loader=_SafeLoader))
+
+
+def _load_yaml_documents(path: str) -> List[Any]:
+    """加载YAML文件（支持以 --- 分隔的多文档流），文件未变化时复用缓存的解析结果。"""
+    stat = os.stat(path)
+    documents = _parse_yaml_cached(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    # 返回副本，避免合并和运行时修改污染缓存
+    return copy.deepcopy(list(documents))
+
+
 class ScriptParser(IScriptParser):
+    # 声明的属性使用槽位存储；IScriptParser 未声明 __slots__，
+    # 因此实例仍保留 __dict__，供 ParserPlugin 动态扩展解析器
+    __slots__ = (
+        'script_data', 'objects', 'events', 'command_parser_config', 'random_tables',
+        'state_machines', 'effects', 'commands', 'player_commands', 'interaction',
+        'meta', 'recipes', '_scene_object_index', '_object_state_index',
+    )
+
     def __init__(self):
         self.script_data = {}
         self.objects = {}  # DSL objects
@@ -28,15 +72,24 @@ class ScriptParser(IScriptParser):
         self.interaction = {}  # DSL interaction
         self.meta = {}  # DSL meta
 
+        # 查找索引（按需构建，加载脚本时重置）
+        self._scene_object_index: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._object_state_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
     def load_script(self, file_path: str) -> Dict[str, Any]:
         """加载并解析YAML脚本文件，支持DSL语法和includes。"""
         logger.info(f"Loading script from file: {file_path}")
-        if not os.path.exists(file_path):
+        try:
+            documents = _load_yaml_documents(file_path)
+        except FileNotFoundError as e:
             logger.error(f"Script file not found: {file_path}")
-            raise FileNotFoundError(f"脚本文件未找到: {file_path}")
+            raise FileNotFoundError(f"脚本文件未找到: {file_path}") from e
 
-        with open(file_path, 'r', encoding='utf-8') as file:
-            self.script_data = yaml.safe_load(file)
+        # 第一个文档为主脚本，后续文档按顺序合并（主文档优先）
+        self.script_data = documents[0] if documents else None
+        for document in documents[1:]:
+            if isinstance(document, dict):
+                self._merge_dicts(self.script_data, document)
 
         logger.debug(f"Script data loaded with {len(self.script_data)} top-level keys")
 
@@ -46,6 +99,8 @@ class ScriptParser(IScriptParser):
 
         self._validate_script()
         self._parse_dsl_structures()
+        self._intern_strings()
+        self._reset_indexes()
         logger.info("Script loaded and parsed successfully")
         return self.script_data
 
@@ -62,30 +117,35 @@ class ScriptParser(IScriptParser):
             if not os.path.isabs(include_path):
                 include_path = os.path.join(base_dir, include_path)
 
-            if not os.path.exists(include_path):
-                logger.error(f"Included script file not found: {include_path}")
-                raise FileNotFoundError(f"包含的脚本文件未找到: {include_path}")
-
             logger.info(f"Loading included script: {include_path}")
-            with open(include_path, 'r', encoding='utf-8') as file:
-                include_data = yaml.safe_load(file)
+            try:
+                documents = _load_yaml_documents(include_path)
+            except FileNotFoundError as e:
+                logger.error(f"Included script file not found: {include_path}")
+                raise FileNotFoundError(f"包含的脚本文件未找到: {include_path}") from e
 
-            # Merge include_data into script_data, with script_data taking precedence
-            self._merge_dicts(self.script_data, include_data)
+            # Merge each document into script_data, with script_data taking precedence
+            for include_data in documents:
+                if isinstance(include_data, dict):
+                    self._merge_dicts(self.script_data, include_data)
 
     def _merge_dicts(self, target: Dict[str, Any], source: Dict[str, Any]):
-        """递归合并字典，target优先。"""
-        for key, value in source.items():
-            if key not in target:
-                target[key] = value
-            elif isinstance(target[key], dict) and isinstance(value, dict):
-                self._merge_dicts(target[key], value)
-            # If key exists and both are not dicts, keep target (no overwrite)
+        """合并字典，target优先。使用显式栈代替递归。"""
+        stack = [(target, source)]
+        while stack:
+            current_target, current_source = stack.pop()
+            for key, value in current_source.items():
+                existing = current_target.get(key, _MISSING)
+                if existing is _MISSING:
+                    current_target[key] = value
+                elif isinstance(existing, dict) and isinstance(value, dict):
+                    stack.append((existing, value))
+                # If key exists and both are not dicts, keep target (no overwrite)
 
     def _validate_script(self):
         """脚本结构的初步验证，支持DSL和传统格式。"""
         # Check for DSL structures
-        has_dsl = any(key in self.script_data for key in ['define_object', 'scene', 'event_system', 'command_parser', 'random_system', 'state_machines', 'effects'])
+        has_dsl = not _DSL_TOP_LEVEL_KEYS.isdisjoint(self.script_data)
 
         if has_dsl:
             # DSL validation
@@ -218,6 +278,57 @@ class ScriptParser(IScriptParser):
             return self.script_data['locations'].get(scene_id, {})
         return {}
 
+    def _intern_strings(self):
+        """驻留字典键以及条件和动作字符串，使相同内容的字符串共享同一对象。"""
+        stack = [self.script_data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                # 驻留键（如命令类型），使按键分发时可通过对象标识快速命中；重建字典以保持键顺序
+                keys = [sys.intern(key) if isinstance(key, str) else key for key in node]
+                if any(new_key is not old_key for new_key, old_key in zip(keys, node)):
+                    values = list(node.values())
+                    node.clear()
+                    node.update(zip(keys, values))
+                for key, value in node.items():
+                    if key in _INTERNED_KEYS:
+                        if isinstance(value, str):
+                            node[key] = sys.intern(value)
+                            continue
+                        if isinstance(value, list):
+                            value[:] = [sys.intern(item) if isinstance(item, str) else item for item in value]
+                    if isinstance(value, (dict, list)):
+                        stack.append(value)
+            elif isinstance(node, list):
+                stack.extend(item for item in node if isinstance(item, (dict, list)))
+
+    def _reset_indexes(self):
+        """清空场景对象和对象状态索引。"""
+        self._scene_object_index = {}
+        self._object_state_index = {}
+
+    def get_scene_object_entries(self, scene_id: str, obj_ref: str) -> List[Dict[str, Any]]:
+        """获取场景中引用指定对象的条目列表（按 ref 建立索引）。"""
+        index = self._scene_object_index.get(scene_id)
+        if index is None:
+            index = {}
+            for obj in self.get_scene(scene_id).get('objects', []):
+                if isinstance(obj, dict) and 'ref' in obj:
+                    index.setdefault(obj['ref'], []).append(obj)
+            self._scene_object_index[scene_id] = index
+        return index.get(obj_ref, [])
+
+    def get_object_state(self, obj_id: str, state_name: str) -> Optional[Dict[str, Any]]:
+        """获取对象定义中指定名称的状态条目（按名称建立索引）。"""
+        index = self._object_state_index.get(obj_id)
+        if index is None:
+            index = {}
+            for state in self.get_object(obj_id).get('states', []):
+                if isinstance(state, dict):
+                    index.setdefault(state.get('name'), state)
+            self._object_state_index[obj_id] = index
+        return index.get(state_name)
+
     def get_start_scene(self) -> str:
         """获取起始场景ID。"""
         if 'world' in self.script_data and 'start' in self.script_data['world']:
@@ -12,10 +12,22 @@ logger = get_logger(__name__)
 class ActionExecutor:
     """统一的动作执行器，处理常见的DSL动作。"""
 
+    __slots__ = ('state', 'command_executor', '_handlers')
+
     def __init__(self, state_manager, command_executor):
         self.state = state_manager
         self.command_executor = command_executor
 
+        # 动作前缀到处理函数的分发表
+        self._handlers = {
+            'set': self._execute_set,
+            'add_flag': self._execute_add_flag,
+            'remove_flag': self._execute_clear_flag,
+            'clear_flag': self._execute_clear_flag,
+            'broadcast': self._execute_broadcast,
+            'log': self._execute_log,
+        }
+
     def execute_action(self, action: str, context: Optional[Dict[str, Any]] = None) -> None:
         """
         执行单个 DSL 动作字符串。
@@ -45,44 +57,47 @@ class ActionExecutor:
             context = {}
 
         try:
-            if action.startswith('set:'):
-                # 变量赋值动作: set:variable=expression
-                var_expr = action[4:].strip()
-                self.command_executor.execute_command({'set': var_expr})
-                logger.debug(f"Executed set action: {var_expr}")
-
-            elif action.startswith('add_flag:'):
-                # 标志设置动作: add_flag:flag_name
-                flag = action[9:].strip()
-                self.state.set_flag(flag)
-                logger.debug(f"Executed add_flag action: {flag}")
-
-            elif action.startswith('remove_flag:') or action.startswith('clear_flag:'):
-                # 标志清除动作: remove_flag:flag_name or clear_flag:flag_name
-                flag = action[12:].strip() if action.startswith('remove_flag:') else action[9:].strip()
-                self.state.clear_flag(flag)
-                logger.debug(f"Executed remove_flag action: {flag}")
-
-            elif action.startswith('broadcast:'):
-                # 消息广播动作: broadcast:message
-                message = action[10:].strip('"\'' )
-                logger.info(f"Action broadcast: {message}")
-                # 添加到游戏消息队列以供界面显示
-                self.state.add_broadcast_message(message)
-
-            elif action.startswith('log:'):
-                # 自定义日志动作: log:message
-                message = action[4:].strip('"\'' )
-                logger.info(f"Action log: {message}")
-
-            else:
+            # 动作字符串常带有运行时数值，按前缀查分发表而不缓存整个字符串
+            command, sep, argument = action.partition(':')
+            handler = self._handlers.get(command) if sep else None
+            if handler is None:
                 # 未知的操作类型 - 记录警告但不失败
                 logger.warning(f"Unknown action: {action}")
+                return
+
+            handler(argument.strip(), context)
 
         except Exception as e:
             logger.error(f"Error executing action '{action}': {e}")
             raise
 
+    def _execute_set(self, var_expr: str, context: Dict[str, Any]) -> None:
+        """变量赋值动作: set:variable=expression"""
+        self.command_executor.execute_command({'set': var_expr})
+        logger.debug("Executed set action: %s", var_expr)
+
+    def _execute_add_flag(self, flag: str, context: Dict[str, Any]) -> None:
+        """标志设置动作: add_flag:flag_name"""
+        self.state.set_flag(flag)
+        logger.debug("Executed add_flag action: %s", flag)
+
+    def _execute_clear_flag(self, flag: str, context: Dict[str, Any]) -> None:
+        """标志清除动作: remove_flag:flag_name 或 clear_flag:flag_name"""
+        self.state.clear_flag(flag)
+        logger.debug("Executed remove_flag action: %s", flag)
+
+    def _execute_broadcast(self, message: str, context: Dict[str, Any]) -> None:
+        """消息广播动作: broadcast:message"""
+        message = message.strip('"\'')
+        logger.info(f"Action broadcast: {message}")
+        # 添加到游戏消息队列以供界面显示
+        self.state.add_broadcast_message(message)
+
+    def _execute_log(self, message: str, context: Dict[str, Any]) -> None:
+        """自定义日志动作: log:message"""
+        message = message.strip('"\'')
+        logger.info(f"Action log: {message}")
+
     def execute_actions(self, actions: list, context: Optional[Dict[str, Any]] = None) -> None:
         """执行多个动作。
 
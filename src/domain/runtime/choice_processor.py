@@ -13,12 +13,17 @@ logger = get_logger(__name__)
 class ChoiceProcessor(IChoiceProcessor):
     """处理玩家选择处理和场景导航。"""
 
+    __slots__ = ('parser', 'state', 'command_executor', 'condition_evaluator', '_choices_cache')
+
     def __init__(self, parser, state_manager, command_executor, condition_evaluator):
         self.parser = parser
         self.state = state_manager
         self.command_executor = command_executor
         self.condition_evaluator = condition_evaluator
 
+        # 可用选择缓存: (场景ID, 状态版本号, 选择元组)
+        self._choices_cache = (None, -1, None)
+
     def process_choice(self, choice_index: int) -> tuple[Optional[str], List[str]]:
         """处理玩家的选择并返回下一个场景和消息列表。"""
         messages = []
@@ -44,8 +49,15 @@ class ChoiceProcessor(IChoiceProcessor):
         return None, messages
 
     def get_available_choices(self) -> List[Dict[str, Any]]:
-        """获取当前可用选择列表。"""
-        current_scene = self.parser.get_scene(self.state.get_current_scene())
+        """获取当前可用选择列表。状态未变化时复用上次的结果。"""
+        scene_id = self.state.get_current_scene()
+        revision = self.state.revision
+        cached_scene_id, cached_revision, cached_choices = self._choices_cache
+        if cached_scene_id == scene_id and cached_revision == revision:
+            # 返回副本，调用方修改结果不会影响缓存
+            return list(cached_choices)
+
+        current_scene = self.parser.get_scene(scene_id)
         choices = current_scene.get('choices', [])
         available_choices = []
         for choice in choices:
@@ -55,4 +67,6 @@ class ChoiceProcessor(IChoiceProcessor):
                     available_choices.append(choice)
             else:
                 available_choices.append(choice)
+
+        self._choices_cache = (scene_id, revision, tuple(available_choices))
         return available_choices
@@ -3,21 +3,84 @@ ScriptRunner 的条件评估器。
 处理选择和其他条件逻辑的条件评估。
 """
 
-from typing import Optional
+from typing import Callable, Dict, List, Optional
+import operator
 import re
 from .interfaces import IConditionEvaluator
 from ...infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 函数式条件: has_flag(name)、has_item(name)、exists:name
+_FUNCTION_PATTERN = re.compile(r'^(has_flag|has_item|exists)\s*[:(]\s*["\']?([^"\')]+?)["\']?\s*\)?\s*$')
+
+# 比较条件: left op right，按最左侧的运算符拆分
+_COMPARISON_PATTERN = re.compile(r'^\s*(.+?)\s*(==|>=|<=|>|<)\s*(.+?)\s*$')
+
+# 数值比较运算符
+_COMPARISON_OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+def _parse_literal(text: str):
+    """将未加引号的字面量解析为 int、float 或 bool，无法解析时返回 None。"""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    lowered = text.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    return None
+
+
+def _split_logical(condition: str, keyword: str) -> List[str]:
+    """按顶层逻辑运算符拆分条件，忽略引号内出现的运算符。"""
+    separator = f' {keyword} '
+    if separator not in condition:
+        return [condition]
+
+    parts = []
+    start = 0
+    quote = None
+    index = 0
+    length = len(condition)
+    while index < length:
+        char = condition[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif condition.startswith(separator, index):
+            parts.append(condition[start:index].strip())
+            index += len(separator)
+            start = index
+            continue
+        index += 1
+    parts.append(condition[start:].strip())
+    return parts
+
 
 class ConditionEvaluator(IConditionEvaluator):
     """评估选择和其他条件逻辑的条件。"""
 
+    __slots__ = ('state', 'parser', '_compiled')
+
     def __init__(self, state_manager, parser=None):
         self.state = state_manager
         self.parser = parser
 
+        # 已编译条件缓存：条件字符串 -> 无参谓词
+        self._compiled: Dict[str, Callable[[], bool]] = {}
+
     def evaluate_condition(self, condition: Optional[str]) -> bool:
         """
         根据当前游戏状态评估条件字符串。
@@ -36,7 +99,7 @@ class ConditionEvaluator(IConditionEvaluator):
             - 相等："variable == value" 或 "variable == "string""
             - 标志检查："has_flag(flag_name)" 或 "has_flag("flag_name")"
             - 数值比较："variable > 5"，"variable < 10"，"variable >= 0"，"variable <= 100"
-            - 否定："!flag_name"（检查标志是否未设置）
+            - 否定："!flag_name"（检查标志是否未设置）或 "not condition"
             - 变量存在性："exists:variable_name"
             - 对象状态："object_name.state_name"（例如，"door.open"）
             - 逻辑运算符："condition1 and condition2"，"condition1 or condition2"
@@ -45,106 +108,137 @@ class ConditionEvaluator(IConditionEvaluator):
             - 字符串值应使用双引号括起来
             - 变量值从游戏状态中获取
             - 对象状态检查需要解析器和当前场景上下文
-            - 逻辑运算符的优先级低于比较运算符
+            - 逻辑运算符的优先级低于比较运算符，and 的优先级高于 or
+            - 引号内的 and/or 不会被视为逻辑运算符
             - 不支持的条件会记录日志，但返回 True 以避免阻碍游戏进行。
         """
         if not condition:
             # 空条件被视为始终为 True（无限制）
             return True
 
-        logger.debug(f"Evaluating condition: {condition}")
-
-        # 先处理逻辑运算符（优先级较低）
-        if ' and ' in condition:
-            parts = condition.split(' and ', 1)
-            return self.evaluate_condition(parts[0].strip()) and self.evaluate_condition(parts[1].strip())
-        elif ' or ' in condition:
-            parts = condition.split(' or ', 1)
-            return self.evaluate_condition(parts[0].strip()) or self.evaluate_condition(parts[1].strip())
-
-        # 相等比较: variable == value
-        if '==' in condition:
-            left, right = condition.split('==', 1)
-            left = left.strip()
-            right = right.strip()
-
-            # 从字符串字面量中移除引号
-            if right.startswith('"') and right.endswith('"'):
-                right = right[1:-1]
-
-            left_value = self._get_value(left)
-            return str(left_value) == right
-
-        # 标志存在检查: has_flag(flag_name)
-        elif 'has_flag' in condition:
-            # Extract flag name from function call syntax
-            flag = condition.split('(', 1)[1].rstrip(')')
-            return self.state.has_flag(flag.strip('"\'')) 
-
-        # 物品存在性检查: has_item(item_name)
-        elif 'has_item' in condition:
-            # 从函数调用语法中提取物品名称
-            item = condition.split('(', 1)[1].rstrip(')')
-            inventory = self.state.get_variable('inventory', [])
-            return item.strip('"\'' ) in inventory
-
-        # 数值比较运算符（按长度顺序检查以避免冲突）
-        elif '>=' in condition:
-            left, right = condition.split('>=', 1)
-            left = left.strip()
-            right = right.strip()
-            left_value = self._get_value(left)
-            right_value = self._get_value(right)
-            return float(left_value) >= float(right_value)
-
-        elif '<=' in condition:
-            left, right = condition.split('<=', 1)
-            left = left.strip()
-            right = right.strip()
-            left_value = self._get_value(left)
-            right_value = self._get_value(right)
-            return float(left_value) <= float(right_value)
-
-        elif '>' in condition:
-            left, right = condition.split('>', 1)
-            left = left.strip()
-            right = right.strip()
-            left_value = self._get_value(left)
-            right_value = self._get_value(right)
-            return float(left_value) > float(right_value)
-
-        elif '<' in condition:
-            left, right = condition.split('<', 1)
-            left = left.strip()
-            right = right.strip()
-            left_value = self._get_value(left)
-            right_value = self._get_value(right)
-            return float(left_value) < float(right_value)
+        logger.debug("Evaluating condition: %s", condition)
+
+        return self._get_predicate(condition)()
+
+    def compile_condition(self, condition: Optional[str]) -> Callable[[], bool]:
+        """返回条件的已编译谓词，调用时读取当前游戏状态。"""
+        return self._get_predicate(condition)
+
+    def _get_predicate(self, condition: str) -> Callable[[], bool]:
+        """获取条件的已编译谓词，首次使用时编译并缓存。空条件视为始终为 True。"""
+        if not condition:
+            return lambda: True
+        predicate = self._compiled.get(condition)
+        if predicate is None:
+            predicate = self._compile(condition)
+            self._compiled[condition] = predicate
+        return predicate
+
+    def _compile(self, condition: str) -> Callable[[], bool]:
+        """将条件字符串解析一次，编译为读取当前游戏状态的无参谓词。"""
+        # 先处理逻辑运算符（优先级较低，or 低于 and）
+        or_parts = _split_logical(condition, 'or')
+        if len(or_parts) > 1:
+            predicates = [self._get_predicate(part) for part in or_parts]
+            return lambda: any(predicate() for predicate in predicates)
+
+        and_parts = _split_logical(condition, 'and')
+        if len(and_parts) > 1:
+            predicates = [self._get_predicate(part) for part in and_parts]
+            return lambda: all(predicate() for predicate in predicates)
+
+        # 逻辑非: not condition
+        if condition.startswith('not '):
+            inner = self._get_predicate(condition[4:].strip())
+            return lambda: not inner()
+
+        # 函数式条件: has_flag(flag_name)、has_item(item_name)、exists:variable_name
+        match = _FUNCTION_PATTERN.match(condition)
+        if match:
+            function, argument = match.groups()
+            if function == 'has_flag':
+                return lambda: self.state.has_flag(argument)
+            if function == 'has_item':
+                return lambda: argument in self.state.get_variable('inventory', [])
+            return lambda: argument in self.state.variables
+
+        # 比较条件: variable == value、variable >= 5 等
+        match = _COMPARISON_PATTERN.match(condition)
+        if match:
+            left, token, right = match.groups()
+            if token == '==':
+                return self._compile_equality(left, right)
+            return self._compile_comparison(left, right, _COMPARISON_OPERATORS[token])
 
         # 否定运算符: !flag_name
-        elif condition.startswith('!'):
+        if condition.startswith('!'):
             flag = condition[1:].strip()
-            return not self.state.has_flag(flag)
-
-        # 变量存在性检查: exists:variable_name
-        elif condition.startswith('exists:'):
-            var_name = condition[7:].strip()
-            return var_name in self.state.variables
+            return lambda: not self.state.has_flag(flag)
 
         # 使用点表示法进行对象状态检查: object.state
         elif '.' in condition:
             parts = condition.split('.', 1)
             if len(parts) == 2:
-                obj_name, state_name = parts
-                return self._check_object_state(obj_name.strip(), state_name.strip())
+                obj_name = parts[0].strip()
+                state_name = parts[1].strip()
+                return lambda: self._check_object_state(obj_name, state_name)
 
         # 不支持的复杂条件的备用方案
         logger.warning(f"Complex condition not fully supported: {condition}")
-        return True
+        return lambda: True
+
+    def _compile_equality(self, left: str, right: str) -> Callable[[], bool]:
+        """编译相等比较，按右侧字面量的类型在编译期选择比较方式。"""
+        if '.' in left:
+            left_value = lambda: self._get_value(left)
+        else:
+            left_value = lambda: self.state.variables.get(left, left)
+
+        # 带引号的字符串字面量：按字符串比较
+        if len(right) >= 2 and right.startswith('"') and right.endswith('"'):
+            text = right[1:-1]
+            return lambda: str(left_value()) == text
+
+        literal = _parse_literal(right)
+        if literal is None:
+            return lambda: str(left_value()) == right
+
+        # 数值/布尔字面量：同类值直接比较，其他值退回字符串比较
+        native_types = (bool,) if isinstance(literal, bool) else (int, float)
+
+        def predicate() -> bool:
+            value = left_value()
+            if type(value) in native_types:
+                return value == literal
+            return str(value) == right
+        return predicate
+
+    def _compile_comparison(self, left: str, right: str,
+                            compare: Callable[[float, float], bool]) -> Callable[[], bool]:
+        """编译数值比较条件，右侧为数字字面量时在编译期完成转换。"""
+        left_value = self._compile_operand(left)
+        try:
+            right_constant = float(right)
+        except ValueError:
+            right_value = self._compile_operand(right)
+            return lambda: compare(left_value(), right_value())
+        return lambda: compare(left_value(), right_constant)
+
+    def _compile_operand(self, expression: str) -> Callable[[], float]:
+        """编译数值比较的操作数（数字字面量、变量或点表示法路径）。"""
+        try:
+            constant = float(expression)
+        except ValueError:
+            pass
+        else:
+            return lambda: constant
+
+        if '.' in expression:
+            return lambda: float(self._get_value(expression))
+        return lambda: float(self.state.variables.get(expression, expression))
 
     def _get_value(self, expression: str):
-        """从表达式中获取值（变量或字面量）。"""
-        expression = expression.strip()
+        """从表达式中获取值（变量或字面量）。表达式应已去除首尾空白。"""
         if '.' in expression:
             # 处理点表示法，如 player.health
             parts = expression.split('.')
@@ -174,30 +268,18 @@ class ConditionEvaluator(IConditionEvaluator):
         if not current_scene_id:
             return False
 
-        scene_data = self.parser.get_scene(current_scene_id)
-        if not scene_data:
+        # 场景中至少有一个引用该对象的条目满足生成条件
+        spawned = any(
+            not obj.get('spawn_condition') or self.evaluate_condition(obj['spawn_condition'])
+            for obj in self.parser.get_scene_object_entries(current_scene_id, obj_name)
+        )
+        if not spawned:
             return False
 
-        # 检查场景中的对象
-        objects = scene_data.get('objects', [])
-        for obj in objects:
-            if isinstance(obj, dict) and obj.get('ref') == obj_name:
-                # 检查生成条件
-                spawn_condition = obj.get('spawn_condition')
-                if spawn_condition and not self.evaluate_condition(spawn_condition):
-                    continue  # 对象未生成
-
-                # 如果状态是'present'，表示对象存在
-                if state_name == 'present':
-                    return True
-
-                # 检查对象的状态
-                obj_def = self.parser.get_object(obj_name)
-                if obj_def:
-                    states = obj_def.get('states', [])
-                    for state in states:
-                        if state.get('name') == state_name:
-                            value = state.get('value', False)
-                            return bool(value)
+        # 如果状态是'present'，表示对象存在
+        if state_name == 'present':
+            return True
 
-        return False
+        # 状态条目可能在运行时被修改（如攻击扣减生命值），因此每次读取当前值
+        state = self.parser.get_object_state(obj_name, state_name)
+        return state is not None and bool(state.get('value', False))
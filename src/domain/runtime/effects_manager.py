@@ -3,7 +3,10 @@ ScriptRunner 的效果管理器。
 处理 DSL 效果系统的应用、持续时间和更新。
 """
 
-from typing import Dict, Any, List, Optional
+import functools
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple, Union
+import re
 import time
 from .interfaces import IEffectsManager
 from ...infrastructure.logger import get_logger
@@ -12,6 +15,76 @@ from ...utils.expression_evaluator import ExpressionEvaluator
 
 logger = get_logger(__name__)
 
+# 生命值修改动作: player.health -= expr 或 player.health += expr
+_HEALTH_PATTERN = re.compile(r'^player\.health\s*(\+=|-=)\s*(.+?)\s*$')
+
+# 在应用效果时规范化为动作列表的字段
+_ACTION_LIST_KEYS = ('apply', 'remove')
+
+
+def _normalize_actions(actions: Any) -> List[str]:
+    """将单个动作字符串或动作列表规范化为列表，其他值视为无动作。"""
+    if isinstance(actions, str):
+        return [actions]
+    if isinstance(actions, list):
+        return actions
+    return []
+
+
+def _parse_duration(duration: Any) -> int:
+    """将持续时间规范化为回合数，支持整数和 "5 turns" 形式的字符串，无法解析时为 0。"""
+    if isinstance(duration, int):
+        return duration
+    if isinstance(duration, str):
+        duration_parts = duration.split()
+        if duration_parts:
+            try:
+                return int(duration_parts[0])
+            except ValueError:
+                pass
+    return 0
+
+
+def _tick_rate_inverse(tick_rate: Any) -> float:
+    """计算tick间隔的倒数；间隔不大于 0 时视为每次更新都执行。"""
+    return 1.0 / max(float(tick_rate), 1e-9)
+
+
+def _parse_modifiers(modifiers: Any) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    将属性修正值拆分为加法修正 {属性: 增量} 和乘法修正 {属性: 倍数}。
+
+    "*1.1" 为乘法修正，"+2"/"-1" 和直接数值为加法修正，其他值忽略。
+    """
+    additive: Dict[str, float] = {}
+    multipliers: Dict[str, float] = {}
+    if not isinstance(modifiers, dict):
+        return additive, multipliers
+
+    for stat_name, modifier_value in modifiers.items():
+        try:
+            if isinstance(modifier_value, str):
+                if modifier_value.startswith('*'):
+                    multipliers[stat_name] = float(modifier_value[1:])
+                elif modifier_value.startswith('+'):
+                    additive[stat_name] = float(modifier_value[1:])
+                elif modifier_value.startswith('-'):
+                    additive[stat_name] = -float(modifier_value[1:])
+            elif isinstance(modifier_value, (int, float)):
+                additive[stat_name] = float(modifier_value)
+        except ValueError:
+            logger.warning(f"Invalid modifier for '{stat_name}': {modifier_value}")
+    return additive, multipliers
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_int_literal(text: str) -> Optional[int]:
+    """将整数字面量字符串转换为整数，非整数字面量返回 None。结果按字符串缓存。"""
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
 
 class EffectsManager(IEffectsManager):
     """管理游戏效果系统。"""
@@ -24,41 +97,35 @@ class EffectsManager(IEffectsManager):
         # 统一的动作执行器
         self.action_executor = ActionExecutor(state_manager, command_executor)
 
+        # 已解析效果动作缓存：动作字符串 -> (处理函数, 参数)
+        self._compiled_actions: Dict[str, Tuple[Optional[Callable], str]] = {}
+
+        # 已规范化的效果模板缓存：效果名 -> 模板
+        self._effect_templates: Dict[str, Dict[str, Any]] = {}
+
         # 活跃效果存储
         self.active_effects: Dict[str, Dict[str, Any]] = {}
 
+        # 批量更新期间暂存的玩家数据，结束时统一写回状态
+        self._batching = False
+        self._batched_player: Optional[Dict[str, Any]] = None
+
         logger.info("EffectsManager initialized")
 
     def apply_effect(self, effect_name: str, target: Optional[str] = None) -> bool:
         """应用效果到目标（默认为玩家）。"""
-        effect_data = self.parser.get_effect(effect_name)
-        if not effect_data:
+        template = self._get_effect_template(effect_name)
+        if template is None:
             logger.warning(f"Effect '{effect_name}' not found")
             return False
 
         # 如果效果已存在，刷新持续时间
         if effect_name in self.active_effects:
-            self.active_effects[effect_name]['duration'] = effect_data.get('duration', 0)
+            self.active_effects[effect_name]['duration'] = template['duration']
             logger.info(f"Refreshed effect: {effect_name}")
         else:
-            # 创建新效果实例
-            effect_instance = effect_data.copy()
-
-            # 解析持续时间字符串
-            duration = effect_instance.get('duration', 0)
-            if isinstance(duration, str):
-                # 解析字符串持续时间，如 "5 turns"
-                duration_parts = duration.split()
-                if duration_parts:
-                    try:
-                        effect_instance['duration'] = int(duration_parts[0])
-                    except ValueError:
-                        effect_instance['duration'] = 0
-                else:
-                    effect_instance['duration'] = 0
-            elif not isinstance(duration, int):
-                effect_instance['duration'] = 0
-
+            # 从预处理过的模板创建新效果实例
+            effect_instance = template.copy()
             effect_instance['start_time'] = time.time()
             effect_instance['target'] = target or 'player'
             self.active_effects[effect_name] = effect_instance
@@ -70,6 +137,30 @@ class EffectsManager(IEffectsManager):
 
         return True
 
+    def _get_effect_template(self, effect_name: str) -> Optional[Dict[str, Any]]:
+        """获取效果模板，首次使用时从解析器读取并完成规范化，之后复用。"""
+        template = self._effect_templates.get(effect_name)
+        if template is not None:
+            return template
+
+        effect_data = self.parser.get_effect(effect_name)
+        if not effect_data:
+            return None
+
+        template = effect_data.copy()
+
+        # 将应用/移除动作统一规范化为列表
+        for action_type in _ACTION_LIST_KEYS:
+            template[action_type] = _normalize_actions(template.get(action_type))
+
+        # 预先解析属性修正值和持续时间
+        template['_mod_add'], template['_mod_mul'] = _parse_modifiers(template.get('modifiers'))
+        template['duration'] = _parse_duration(template.get('duration', 0))
+        template['_tick_rate_inv'] = _tick_rate_inverse(template.get('tick_rate', 1))
+
+        self._effect_templates[effect_name] = template
+        return template
+
     def remove_effect(self, effect_name: str) -> bool:
         """移除效果。"""
         if effect_name in self.active_effects:
@@ -86,50 +177,68 @@ class EffectsManager(IEffectsManager):
 
     def update_effects(self) -> None:
         """更新所有活跃效果，处理持续时间和tick动作。"""
-        current_time = time.time()
-        expired_effects = []
-
-        for effect_name, effect_data in self.active_effects.items():
+        # 生命值修改在本轮更新结束时一次性写回
+        self._batching = True
+        try:
+            self._sweep_effects()
+        finally:
+            self._batching = False
+            player, self._batched_player = self._batched_player, None
+            if player is not None:
+                self.state.set_variable('player', player)
+
+    def _sweep_effects(self) -> None:
+        """递减持续时间、移除过期效果并执行到期的tick动作。"""
+        # 仅在存在tick动作时才读取当前时间
+        current_time = None
+
+        # 循环中使用的绑定方法提前取到局部变量
+        remove_effect = self.remove_effect
+        execute_tick_action = self._execute_tick_action
+
+        # 遍历快照，以便在遍历过程中直接移除过期效果
+        for effect_name, effect_data in list(self.active_effects.items()):
             # 检查持续时间
             duration = effect_data.get('duration', 0)
             if duration > 0:
                 # 减少持续时间
-                effect_data['duration'] -= 1
+                duration -= 1
+                effect_data['duration'] = duration
 
                 # 检查是否到期
-                if effect_data['duration'] <= 0:
-                    expired_effects.append(effect_name)
+                if duration <= 0:
+                    remove_effect(effect_name)
                     continue
 
-            # 执行tick动作（如果有）
+            # 执行tick动作（如果有），其余tick字段仅在需要时读取
             tick_action = effect_data.get('tick')
-            if tick_action:
-                tick_rate = effect_data.get('tick_rate', 1)  # 每回合执行一次
-
-                # 计算自开始以来经过的tick数
-                elapsed_ticks = int((current_time - effect_data['start_time']) / tick_rate)
-                last_tick = effect_data.get('last_tick', 0)
-
-                if elapsed_ticks > last_tick:
-                    self._execute_tick_action(tick_action, effect_data)
-                    effect_data['last_tick'] = elapsed_ticks
-
-        # 移除过期效果
-        for effect_name in expired_effects:
-            self.remove_effect(effect_name)
-
-    def get_active_effects(self, target: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
-        """获取活跃效果，可按目标过滤。"""
+            if not tick_action:
+                continue
+
+            if current_time is None:
+                current_time = time.time()
+
+            # 计算自开始以来经过的tick数（乘以预先计算的tick间隔倒数），默认每回合执行一次
+            tick_rate_inv = effect_data.get('_tick_rate_inv')
+            if tick_rate_inv is None:
+                tick_rate_inv = effect_data['_tick_rate_inv'] = _tick_rate_inverse(effect_data.get('tick_rate', 1))
+            elapsed_ticks = int((current_time - effect_data['start_time']) * tick_rate_inv)
+            if elapsed_ticks > effect_data.get('last_tick', 0):
+                execute_tick_action(tick_action, effect_data)
+                effect_data['last_tick'] = elapsed_ticks
+
+    def get_active_effects(self, target: Optional[str] = None) -> Mapping[str, Dict[str, Any]]:
+        """获取活跃效果，可按目标过滤。未指定目标时返回只读视图而非副本。"""
         if target is None:
-            return self.active_effects.copy()
+            return MappingProxyType(self.active_effects)
 
         return {name: data for name, data in self.active_effects.items()
                 if data.get('target') == target}
 
     def has_effect(self, effect_name: str, target: Optional[str] = None) -> bool:
         """检查目标是否拥有指定效果。"""
-        effects = self.get_active_effects(target)
-        return effect_name in effects
+        effect_data = self.active_effects.get(effect_name)
+        return effect_data is not None and (target is None or effect_data.get('target') == target)
 
     def get_effect_modifier(self, stat_name: str, target: Optional[str] = None) -> float:
         """
@@ -137,59 +246,58 @@ class EffectsManager(IEffectsManager):
 
         此方法汇总作用于目标（默认：player）的所有效果的修改值。
         修改值可以是加法（5，-2）、乘法（*1.1）或直接数值。
-        应用顺序对于乘法修改值非常重要。
+        加法与乘法修正分别累计，结果与效果的应用顺序无关。
 
         Args:
             stat_name: 要获取修正值的属性名称 (例如, 'strength', 'health')
             target: 目标实体名称，如果为 None，则默认为 'player'
 
         Returns:
-            应用于属性的总修改器数值。对于乘法修改器，这会返回合并后的乘数（例如，10% 增加对应 1.1）
+            应用于属性的总修改器数值。只有乘法修改器时返回合并后的乘数（例如，10% 增加对应 1.1）；
+            同时存在加法修改器时返回加成总和乘以合并后的乘数。
 
         Note:
-            - 加成修正（ /-）直接相加
+            - 加成修正（+/-）直接相加
             - 乘法修正（*）相乘
             - 直接数值视为加成
+            - 修正值在应用效果时解析一次
             - 复杂的属性计算应由调用方处理
         """
-        total_modifier = 0.0
-        effects = self.get_active_effects(target)
-
-        for effect_data in effects.values():
-            modifiers = effect_data.get('modifiers', {})
-            if stat_name in modifiers:
-                modifier_value = modifiers[stat_name]
-
-                # 根据字符串前缀或直接值处理不同类型的修饰符
-                if isinstance(modifier_value, str):
-                    if modifier_value.startswith('*'):
-                        # 乘法修饰符，例如，"*1.1"表示增加10%
-                        multiplier = float(modifier_value[1:])
-                        # 乘以现有的修饰符（乘法初始值为 1.0）
-                        if total_modifier == 0.0:
-                            total_modifier = multiplier
-                        else:
-                            total_modifier *= multiplier
-                    elif modifier_value.startswith('+'):
-                        # 加法修饰符，例如，“2”表示加2
-                        total_modifier += float(modifier_value[1:])
-                    elif modifier_value.startswith('-'):
-                        # 减法修饰符，例如：“-1”表示减去1
-                        total_modifier -= float(modifier_value[1:])
-                elif isinstance(modifier_value, (int, float)):
-                    # 直接数值修饰符，视为加法
-                    total_modifier += modifier_value
-
-        return total_modifier
+        additive = 0.0
+        multiplier = 1.0
+        has_additive = False
+        has_multiplier = False
+
+        for effect_data in self.active_effects.values():
+            if target is not None and effect_data.get('target') != target:
+                continue
+            mod_add = effect_data.get('_mod_add')
+            if mod_add is None:
+                # 未经 apply_effect 加入的效果，首次查询时解析
+                mod_add, effect_data['_mod_mul'] = _parse_modifiers(effect_data.get('modifiers'))
+                effect_data['_mod_add'] = mod_add
+
+            if stat_name in mod_add:
+                additive += mod_add[stat_name]
+                has_additive = True
+            mod_mul = effect_data['_mod_mul']
+            if stat_name in mod_mul:
+                multiplier *= mod_mul[stat_name]
+                has_multiplier = True
+
+        # 按是否存在加法修正判断，而非加成总和的值（正负修正可能相互抵消）
+        if has_additive:
+            return additive * multiplier
+        return multiplier if has_multiplier else 0.0
 
     def _execute_effect_actions(self, effect_data: Dict[str, Any], action_type: str) -> None:
         """执行效果的特定类型动作。"""
-        actions = effect_data.get(action_type, [])
-        if isinstance(actions, list):
-            for action in actions:
-                self._execute_single_action(action, effect_data)
-        elif isinstance(actions, str):
-            self._execute_single_action(actions, effect_data)
+        actions = effect_data.get(action_type) or ()
+        if isinstance(actions, str):
+            # 未经 apply_effect 直接加入的效果可能仍使用单个字符串
+            actions = (actions,)
+        for action in actions:
+            self._execute_single_action(action, effect_data)
 
     def _execute_tick_action(self, tick_action: str, effect_data: Dict[str, Any]) -> None:
         """执行tick动作。"""
@@ -198,74 +306,113 @@ class EffectsManager(IEffectsManager):
     def _execute_single_action(self, action: str, effect_data: Dict[str, Any]) -> None:
         """执行单个效果动作。"""
         try:
-            if action.startswith('player.health'):
-                # 生命值修改，如 "player.health -= 5" 或 "player.health += 10"
-                if '-=' in action:
-                    parts = action.split('-=', 1)
-                    damage_str = parts[1].strip()
-                    # 支持表达式，如 "5" 或 "strength * 2"
-                    damage = self._parse_damage_expression(damage_str, effect_data)
-                    player = self.state.get_variable('player', {'health': 100})
-                    current_health = player.get('health', 100)
-                    new_health = max(0, current_health - damage)
-                    player['health'] = new_health
-                    self.state.set_variable('player', player)
-                    logger.debug(f"Effect damage: {damage}, health now {new_health}")
-                elif '+=' in action:
-                    parts = action.split('+=', 1)
-                    heal_str = parts[1].strip()
-                    heal = self._parse_damage_expression(heal_str, effect_data)
-                    player = self.state.get_variable('player', {'health': 100})
-                    current_health = player.get('health', 100)
-                    new_health = current_health + heal
-                    player['health'] = new_health
-                    self.state.set_variable('player', player)
-                    logger.debug(f"Effect heal: {heal}, health now {new_health}")
-            else:
-                # 使用统一的动作执行器处理其他动作
-                self.action_executor.execute_action(action, effect_data)
+            compiled = self._compiled_actions.get(action)
+            if compiled is None:
+                compiled = self._compile_action(action)
+                self._compiled_actions[action] = compiled
+
+            handler, argument = compiled
+            if handler is not None:
+                handler(argument, effect_data)
 
         except Exception as e:
             logger.error(f"Error executing effect action '{action}': {e}")
 
+    def _compile_action(self, action: str) -> Tuple[Optional[Callable], Union[int, str]]:
+        """将效果动作字符串解析一次，返回 (处理函数, 参数)。整数字面量在编译期完成转换。"""
+        # 生命值修改，如 "player.health -= 5" 或 "player.health += 10"
+        match = _HEALTH_PATTERN.match(action)
+        if match:
+            operator, operand = match.groups()
+            constant = _parse_int_literal(operand)
+            if constant is not None:
+                operand = constant
+            if operator == '-=':
+                return self._execute_health_damage, operand
+            return self._execute_health_heal, operand
+        if action.startswith('player.health'):
+            logger.warning(f"Unsupported health modification: {action}")
+            return None, action
+
+        # 使用统一的动作执行器处理其他动作
+        return self.action_executor.execute_action, action
+
+    def _execute_health_damage(self, damage: Union[int, str], effect_data: Dict[str, Any]) -> None:
+        """扣减玩家生命值，最低为 0。"""
+        # 支持编译期常量或表达式，如 "strength * 2"
+        if type(damage) is not int:
+            damage = self._parse_damage_expression(damage, effect_data)
+        player = self._get_player()
+        current_health = player.get('health', 100)
+        new_health = max(0, current_health - damage)
+        player['health'] = new_health
+        self._store_player(player)
+        logger.debug("Effect damage: %s, health now %s", damage, new_health)
+
+    def _execute_health_heal(self, heal: Union[int, str], effect_data: Dict[str, Any]) -> None:
+        """恢复玩家生命值。"""
+        if type(heal) is not int:
+            heal = self._parse_damage_expression(heal, effect_data)
+        player = self._get_player()
+        current_health = player.get('health', 100)
+        new_health = current_health + heal
+        player['health'] = new_health
+        self._store_player(player)
+        logger.debug("Effect heal: %s, health now %s", heal, new_health)
+
+    def _get_player(self) -> Dict[str, Any]:
+        """获取玩家数据；批量更新期间只从状态管理器读取一次。"""
+        if self._batched_player is not None:
+            return self._batched_player
+        player = self.state.get_variable('player', {'health': 100})
+        if self._batching:
+            self._batched_player = player
+        return player
+
+    def _store_player(self, player: Dict[str, Any]) -> None:
+        """写回玩家数据；批量更新期间延迟到更新结束时写回。"""
+        if self._batching:
+            self._batched_player = player
+        else:
+            self.state.set_variable('player', player)
+
     def _parse_damage_expression(self, damage_str: str, effect_data: Dict[str, Any]) -> int:
         """解析伤害表达式，支持数字和复杂表达式。"""
-        try:
-            # 尝试直接转换为整数
-            return int(damage_str)
-        except ValueError:
-            # 构建表达式评估上下文
-            context = {}
+        # 整数字面量（最常见的情况）直接使用缓存的转换结果
+        value = _parse_int_literal(damage_str)
+        if value is not None:
+            return value
 
-            # 添加玩家属性
-            player = self.state.get_variable('player', {})
-            if isinstance(player, dict):
-                context['player'] = player
+        # 构建表达式评估上下文
+        context = {}
 
-            # 添加效果数据
-            context['effect'] = effect_data
+        # 添加玩家属性
+        player = self.state.get_variable('player', {})
+        if isinstance(player, dict):
+            context['player'] = player
 
-            # 添加其他常用游戏状态变量
-            common_vars = ['strength', 'health', 'max_health', 'level', 'experience', 'game_time']
-            for var in common_vars:
-                value = self.state.get_variable(var)
-                if value is not None:
-                    context[var] = value
+        # 添加效果数据
+        context['effect'] = effect_data
 
-            # 使用表达式评估器评估复杂表达式
-            result = ExpressionEvaluator.evaluate_expression(damage_str, context)
+        # 添加其他常用游戏状态变量
+        common_vars = ['strength', 'health', 'max_health', 'level', 'experience', 'game_time']
+        for var in common_vars:
+            value = self.state.get_variable(var)
+            if value is not None:
+                context[var] = value
 
-            # 确保结果是整数
-            try:
-                return int(result)
-            except (TypeError, ValueError):
-                logger.warning(f"Expression '{damage_str}' did not evaluate to a number, using default 5")
-                return 5
+        # 使用表达式评估器评估复杂表达式
+        result = ExpressionEvaluator.evaluate_expression(damage_str, context)
+
+        # 确保结果是整数
+        try:
+            return int(result)
+        except (TypeError, ValueError):
+            logger.warning(f"Expression '{damage_str}' did not evaluate to a number, using default 5")
+            return 5
 
     def get_status_message(self) -> str:
         """获取效果状态消息。"""
-        if not self.active_effects:
-            return ""
-
-        effect_names = list(self.active_effects.keys())
-        return f"效果: {', '.join(effect_names)}"
+        if self.active_effects:
+            return f"效果: {', '.join(self.active_effects)}"
+        return ""
@@ -3,8 +3,10 @@ ScriptRunner 的事件管理器。
 处理 DSL 事件系统的调度和触发。
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import operator
 import random
+import re
 import time
 from .interfaces import IEventManager
 from ...infrastructure.logger import get_logger
@@ -12,6 +14,41 @@ from .action_executor import ActionExecutor
 
 logger = get_logger(__name__)
 
+# 时间触发器: time > 100、time <= 50 等
+_TIME_TRIGGER_PATTERN = re.compile(r'^time (>=|<=|>|<) (.+)$')
+
+# 时间触发器比较运算符
+_TIME_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+
+def _parse_time_trigger(trigger: str) -> Optional[Tuple[Callable[[float, float], bool], float]]:
+    """将时间触发器解析为 (比较函数, 阈值)，不是时间触发器或阈值无效时返回 None。"""
+    match = _TIME_TRIGGER_PATTERN.match(trigger)
+    if not match:
+        return None
+    try:
+        return _TIME_OPERATORS[match[1]], float(match[2])
+    except ValueError:
+        logger.warning(f"Invalid time trigger threshold: {trigger}")
+        return None
+
+
+def _parse_reactive_trigger(event_trigger: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """将反应触发器解析为 (类型, 键, 期望值)，无法识别时返回 None。"""
+    if event_trigger.startswith('player.action = '):
+        return 'player_action', event_trigger[16:].strip('"\''), None
+    if event_trigger.startswith('world.'):
+        world_prop = event_trigger[6:]
+        if '=' in world_prop:
+            key, value = world_prop.split('=', 1)
+            return 'world', key.strip(), value.strip().strip('"\'')
+    return None
+
 
 class EventManager(IEventManager):
     """管理游戏事件系统。"""
@@ -25,6 +62,25 @@ class EventManager(IEventManager):
         # 统一的动作执行器
         self.action_executor = ActionExecutor(state_manager, command_executor)
 
+        # 事件动作前缀到处理函数的分发表
+        self._event_action_handlers = {
+            'spawn_object': self._execute_spawn_object_event,
+            'transform': self._execute_transform_event,
+            'broadcast': self._execute_broadcast_event,
+            'log': self._execute_log_event,
+        }
+
+        # 已解析时间触发器缓存：触发器字符串 -> (比较函数, 阈值) 或 None
+        self._compiled_time_triggers: Dict[str, Optional[Tuple[Callable[[float, float], bool], float]]] = {}
+
+        # 反应事件分发索引: 玩家动作 -> [(事件, 条件谓词)]；世界触发器事件对所有触发类型都是候选
+        # 在设置 reactive_events 时重建
+        self._reactive_index: Dict[str, List[Tuple[Dict[str, Any], Tuple[Callable[[], bool], ...]]]] = {}
+        self._reactive_world: List[Tuple[Dict[str, Any], Tuple[Callable[[], bool], ...]]] = []
+
+        # 已解析反应触发器缓存：触发器字符串 -> (类型, 键, 期望值) 或 None
+        self._compiled_triggers: Dict[str, Optional[Tuple[str, str, Optional[str]]]] = {}
+
         # 事件数据
         self.scheduled_events = []
         self.reactive_events = []
@@ -33,6 +89,17 @@ class EventManager(IEventManager):
         # 加载事件数据
         self._load_events()
 
+    @property
+    def reactive_events(self) -> List[Dict[str, Any]]:
+        """反应事件列表。"""
+        return self._reactive_events
+
+    @reactive_events.setter
+    def reactive_events(self, events: List[Dict[str, Any]]) -> None:
+        """设置反应事件列表并重建分发索引。运行时增删或修改事件后需重新赋值。"""
+        self._reactive_events = events
+        self._build_reactive_index()
+
     def _load_events(self):
         """从解析器加载事件数据。"""
         try:
@@ -51,71 +118,88 @@ class EventManager(IEventManager):
 
     def check_scheduled_events(self) -> None:
         """检查定时事件是否应该触发。"""
-        current_time = time.time()
         game_time = self.state.get_variable('game_time', 0)  # 假设有游戏时间变量
+        roll = random.random
+        get_time_trigger = self._get_time_trigger
 
         for event in self.scheduled_events:
-            trigger = event.get('trigger', '')
-            chance = event.get('chance', 1.0)
-            action = event.get('action', '')
-
-            # 检查时间触发条件
-            if self._check_time_trigger(trigger, game_time):
-                # 检查随机几率
-                if random.random() <= chance:
+            # 检查时间触发条件（触发器字符串只解析一次）
+            parsed = get_time_trigger(event.get('trigger', ''))
+            if parsed is None:
+                continue
+            compare, threshold = parsed
+            if compare(game_time, threshold):
+                # 检查随机几率（必定触发的事件无需掷骰）
+                chance = event.get('chance', 1.0)
+                if chance >= 1.0 or roll() <= chance:
+                    action = event.get('action', '')
                     self._execute_event_action(action, event)
                     logger.info(f"Scheduled event triggered: {action}")
 
+    def _get_time_trigger(self, trigger: str) -> Optional[Tuple[Callable[[float, float], bool], float]]:
+        """获取时间触发器的解析结果，首次使用时解析并缓存。"""
+        try:
+            return self._compiled_time_triggers[trigger]
+        except KeyError:
+            parsed = self._compiled_time_triggers[trigger] = _parse_time_trigger(trigger)
+            return parsed
+
     def check_reactive_events(self, trigger_type: str, **kwargs) -> None:
-        """检查反应事件是否应该触发。"""
-        for event in self.reactive_events:
+        """检查反应事件是否应该触发。只遍历按触发类型和键索引出的候选事件。"""
+        for event, predicates in self._get_reactive_candidates(trigger_type, kwargs):
             event_trigger = event.get('trigger', '')
 
             # 检查触发类型匹配
             if self._matches_trigger(event_trigger, trigger_type, kwargs):
-                # 检查条件
-                conditions = event.get('conditions', [])
-                if self._check_conditions(conditions):
+                # 检查条件（建立索引时已预编译）
+                if all(predicate() for predicate in predicates):
                     actions = event.get('actions', [])
                     self._execute_actions(actions)
                     logger.info(f"Reactive event triggered: {event_trigger}")
 
-    def _check_time_trigger(self, trigger: str, game_time: float) -> bool:
-        """检查时间触发条件。"""
-        if trigger.startswith('time > '):
-            threshold = float(trigger[7:])
-            return game_time > threshold
-        elif trigger.startswith('time >= '):
-            threshold = float(trigger[8:])
-            return game_time >= threshold
-        elif trigger.startswith('time < '):
-            threshold = float(trigger[7:])
-            return game_time < threshold
-        elif trigger.startswith('time <= '):
-            threshold = float(trigger[8:])
-            return game_time <= threshold
-        return False
+    def _get_reactive_candidates(self, trigger_type: str,
+                                 kwargs: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Tuple[Callable[[], bool], ...]]]:
+        """返回可能匹配触发类型的 (反应事件, 条件谓词)，保持事件的原有顺序。"""
+        if trigger_type == 'player_action':
+            return self._reactive_index.get(kwargs.get('action'), self._reactive_world)
+        return self._reactive_world
+
+    def _build_reactive_index(self) -> None:
+        """按解析后的触发器为反应事件建立分发索引，并预编译每个事件的条件。"""
+        compile_condition = self.condition_evaluator.compile_condition
+        parsed_events = []
+        for event in self.reactive_events:
+            parsed = self._get_parsed_trigger(event.get('trigger', ''))
+            if parsed is not None:
+                predicates = tuple(compile_condition(condition) for condition in event.get('conditions', []))
+                parsed_events.append((parsed, (event, predicates)))
+
+        # 每个玩家动作的候选列表同时包含世界触发器事件，以保持事件的原有顺序
+        actions = {key for (kind, key, _), _ in parsed_events if kind == 'player_action'}
+        self._reactive_index = {
+            action: [entry for (kind, key, _), entry in parsed_events if kind == 'world' or key == action]
+            for action in actions
+        }
+        self._reactive_world = [entry for (kind, _, _), entry in parsed_events if kind == 'world']
+
+    def _get_parsed_trigger(self, event_trigger: str) -> Optional[Tuple[str, str, Optional[str]]]:
+        """获取反应触发器的解析结果，首次使用时解析并缓存。"""
+        try:
+            return self._compiled_triggers[event_trigger]
+        except KeyError:
+            parsed = self._compiled_triggers[event_trigger] = _parse_reactive_trigger(event_trigger)
+            return parsed
 
     def _matches_trigger(self, event_trigger: str, trigger_type: str, kwargs: Dict[str, Any]) -> bool:
         """检查事件触发器是否匹配。"""
-        if event_trigger.startswith('player.action = '):
-            action = event_trigger[16:].strip('"\'' )
-            return trigger_type == 'player_action' and kwargs.get('action') == action
-        elif event_trigger.startswith('world.'):
-            world_prop = event_trigger[6:]
-            if '=' in world_prop:
-                key, value = world_prop.split('=', 1)
-                key = key.strip()
-                value = value.strip().strip('"\'' )
-                return self.state.get_variable(f'world_{key}') == value
-        return False
-
-    def _check_conditions(self, conditions: List[str]) -> bool:
-        """检查事件条件。"""
-        for condition in conditions:
-            if not self.condition_evaluator.evaluate_condition(condition):
-                return False
-        return True
+        parsed = self._get_parsed_trigger(event_trigger)
+        if parsed is None:
+            return False
+
+        kind, key, value = parsed
+        if kind == 'player_action':
+            return trigger_type == 'player_action' and kwargs.get('action') == key
+        return self.state.get_variable(f'world_{key}') == value
 
     def _execute_event_action(self, action: str, event: Dict[str, Any]) -> None:
         """执行事件动作。"""
@@ -123,36 +207,47 @@ class EventManager(IEventManager):
             # 示例：生成狼人
             self.state.set_variable('werewolf_spawned', True)
             logger.info("Werewolf spawned due to event")
-        elif action.startswith('spawn_object:'):
-            obj_name = action[13:].strip()
-            # 在当前场景添加对象
-            current_scene = self.state.get_current_scene()
-            if current_scene:
-                # 这里需要扩展状态管理器来支持场景对象
-                logger.info(f"Object {obj_name} spawned in scene {current_scene}")
-        elif action.startswith('transform:'):
-            # 对象变换
-            transform_spec = action[10:]
-            logger.info(f"Transformation triggered: {transform_spec}")
-        elif action.startswith('broadcast:'):
-            message = action[10:].strip('"\'' )
-            # 添加到游戏消息队列以供界面显示
-            self.state.add_broadcast_message(message)
-            logger.info(f"Broadcast message: {message}")
-        elif action == 'log:':
+            return
+
+        command, sep, argument = action.partition(':')
+        handler = self._event_action_handlers.get(command) if sep else None
+        if handler:
+            handler(argument, event)
+
+    def _execute_spawn_object_event(self, argument: str, event: Dict[str, Any]) -> None:
+        """在当前场景生成对象。"""
+        obj_name = argument.strip()
+        current_scene = self.state.get_current_scene()
+        if current_scene:
+            # 这里需要扩展状态管理器来支持场景对象
+            logger.info(f"Object {obj_name} spawned in scene {current_scene}")
+
+    def _execute_transform_event(self, argument: str, event: Dict[str, Any]) -> None:
+        """对象变换。"""
+        logger.info(f"Transformation triggered: {argument}")
+
+    def _execute_broadcast_event(self, argument: str, event: Dict[str, Any]) -> None:
+        """添加广播消息到游戏消息队列以供界面显示。"""
+        message = argument.strip('"\'')
+        self.state.add_broadcast_message(message)
+        logger.info(f"Broadcast message: {message}")
+
+    def _execute_log_event(self, argument: str, event: Dict[str, Any]) -> None:
+        """记录事件消息（仅限不带参数的 log: 动作）。"""
+        if not argument:
             message = event.get('message', 'Event logged')
             logger.info(f"Event log: {message}")
 
     def _execute_actions(self, actions: List[str]) -> None:
         """执行多个动作。"""
         for action in actions:
-            if action.startswith('spawn_object:'):
-                obj_name = action[13:].strip('"\'' )
+            command, sep, argument = action.partition(':')
+            if sep and command == 'spawn_object':
+                obj_name = argument.strip('"\'')
                 logger.info(f"Spawning object: {obj_name}")
-            elif action.startswith('transform:'):
+            elif sep and command == 'transform':
                 # 对象变换
-                transform_spec = action[10:]
-                logger.info(f"Transformation triggered: {transform_spec}")
+                logger.info(f"Transformation triggered: {argument}")
             else:
                 # 使用统一的动作执行器处理其他动作
                 self.action_executor.execute_action(action)
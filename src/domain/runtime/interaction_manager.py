@@ -3,7 +3,7 @@ ScriptRunner 的互动管理器。
 处理 DSL 互动系统的多步骤互动和物理互动。
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import random
 from .interfaces import IInteractionManager
 from ...infrastructure.logger import get_logger
@@ -11,6 +11,31 @@ from ...infrastructure.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _compile_physics_modifiers(modifiers: Dict[str, Any]) -> List[Tuple[str, Optional[int], float]]:
+    """
+    将物理互动修改器解析为 (属性, 阈值, 系数) 列表。
+
+    简单乘数（如 "2"）的阈值为 None；"0.1 per point above 10" 形式的阈值为 10。
+    无法识别或无法解析的修改器会被忽略。
+    """
+    compiled = []
+    for attr, modifier in modifiers.items():
+        try:
+            if isinstance(modifier, (int, float)):
+                compiled.append((attr, None, float(modifier)))
+            elif '.' in modifier:
+                # 复杂修改器，如 "0.1 per point above 10"
+                parts = modifier.split()
+                if len(parts) >= 5 and parts[1] == 'per' and parts[2] == 'point' and parts[3] == 'above':
+                    compiled.append((attr, int(parts[4]), float(parts[0])))
+            else:
+                # 简单乘数
+                compiled.append((attr, None, float(modifier)))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid physics modifier for {attr}: {modifier}")
+    return compiled
+
+
 class InteractionManager(IInteractionManager):
     """管理游戏互动系统。"""
 
@@ -25,6 +50,10 @@ class InteractionManager(IInteractionManager):
         # 当前活跃的多步骤互动
         self.active_interactions: Dict[str, Dict[str, Any]] = {}
 
+        # 已解析的物理互动修改器：互动类型 -> [(属性, 阈值, 系数)]，互动数据被替换时失效
+        self._compiled_modifiers: Dict[str, List[Tuple[str, Optional[int], float]]] = {}
+        self._compiled_modifiers_source: Optional[Dict[str, Any]] = None
+
         logger.info("InteractionManager initialized")
 
     def load_interaction_data(self):
@@ -114,26 +143,15 @@ class InteractionManager(IInteractionManager):
         interaction = physics_data[interaction_type]
 
         # 计算成功几率
-        base_chance = interaction.get('base_chance', 0.5)
-        modifiers = interaction.get('modifiers', {})
+        chance = interaction.get('base_chance', 0.5)
 
-        # 应用修改器
-        chance = base_chance
-        for attr, modifier in modifiers.items():
-            if '.' in modifier:
-                # 复杂修改器，如 "0.1 per point above 10"
-                parts = modifier.split()
-                if len(parts) >= 4 and parts[1] == 'per' and parts[2] == 'point' and parts[3] == 'above':
-                    threshold = int(parts[4])
-                    per_point = float(parts[0])
-                    attr_value = self.state.get_variable(attr, 0)
-                    if attr_value > threshold:
-                        bonus = (attr_value - threshold) * per_point
-                        chance += bonus
-            else:
-                # 简单乘数
-                attr_value = self.state.get_variable(attr, 0)
-                chance += attr_value * float(modifier)
+        # 应用修改器（修改器字符串在首次使用时解析一次）
+        for attr, threshold, factor in self._get_compiled_modifiers(interaction_type, interaction):
+            attr_value = self.state.get_variable(attr, 0)
+            if threshold is None:
+                chance += attr_value * factor
+            elif attr_value > threshold:
+                chance += (attr_value - threshold) * factor
 
         # 确保几率在0-1之间
         chance = max(0, min(1, chance))
@@ -146,6 +164,19 @@ class InteractionManager(IInteractionManager):
         else:
             return {'success': False, 'message': f"你未能成功执行 {interaction_type}。"}
 
+    def _get_compiled_modifiers(self, interaction_type: str,
+                                interaction: Dict[str, Any]) -> List[Tuple[str, Optional[int], float]]:
+        """获取物理互动的已解析修改器，互动数据被替换后重新解析。"""
+        if self._compiled_modifiers_source is not self.interaction_data:
+            self._compiled_modifiers = {}
+            self._compiled_modifiers_source = self.interaction_data
+
+        compiled = self._compiled_modifiers.get(interaction_type)
+        if compiled is None:
+            compiled = _compile_physics_modifiers(interaction.get('modifiers', {}))
+            self._compiled_modifiers[interaction_type] = compiled
+        return compiled
+
     def _validate_input(self, validation: str, input_data: Dict[str, Any]) -> bool:
         """验证输入数据。"""
         # 这里实现简单的验证逻辑
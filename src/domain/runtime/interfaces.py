@@ -4,7 +4,8 @@ ScriptRunner 运行时组件抽象接口。
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
+import functools
 
 
 class ISceneExecutor(ABC):
@@ -33,15 +34,23 @@ class ICommandExecutor(ABC):
 class IConditionEvaluator(ABC):
     """条件评估器接口。"""
 
+    __slots__ = ()
+
     @abstractmethod
     def evaluate_condition(self, condition: Optional[str]) -> bool:
         """评估条件字符串。"""
         pass
 
+    def compile_condition(self, condition: Optional[str]) -> Callable[[], bool]:
+        """返回评估该条件的无参谓词，供需要反复评估同一条件的调用方预先获取。"""
+        return functools.partial(self.evaluate_condition, condition)
+
 
 class IChoiceProcessor(ABC):
     """选择处理器接口。"""
 
+    __slots__ = ()
+
     @abstractmethod
     def process_choice(self, choice_index: int) -> tuple[Optional[str], List[str]]:
         """处理玩家选择并返回下一个场景和消息列表。"""
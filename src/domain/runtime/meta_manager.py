@@ -4,6 +4,8 @@ ScriptRunner 的元管理器。
 """
 
 from typing import Dict, Any, List, Optional, Callable
+import json
+import random
 import re
 import yaml
 from collections import defaultdict, Counter
@@ -95,7 +97,6 @@ class MetaManager(IMetaManager):
 
         # 解析生成的脚本
         try:
-            import yaml
             generated_data = yaml.safe_load(generated_script)
             logger.info(f"Generated dynamic script '{script_name}' with parameters: {parameters}")
             return generated_data
@@ -150,19 +151,16 @@ class MetaManager(IMetaManager):
                 if self.random_manager:
                     replacements[param] = self.random_manager.get_random_from_table('enemy_types') or '哥布林'
                 else:
-                    import random
                     replacements[param] = random.choice(['哥布林', '狼人', '宝藏'])
             elif param == 'reward':
                 if self.random_manager:
                     replacements[param] = self.random_manager.get_random_from_table('rewards') or '金币'
                 else:
-                    import random
                     replacements[param] = random.choice(['金币', '武器', '药水'])
             elif param == 'location':
                 if self.random_manager:
                     replacements[param] = self.random_manager.get_random_from_table('locations') or '森林'
                 else:
-                    import random
                     replacements[param] = random.choice(['森林', '山洞', '村庄'])
 
         # 替换模板
@@ -197,7 +195,6 @@ class MetaManager(IMetaManager):
                 "空气中弥漫着潮湿的泥土味。",
                 "远处传来滴水的声音。"
             ]
-            import random
             return random.choice(descriptions)
 
         # 构建马尔可夫链
@@ -211,7 +208,6 @@ class MetaManager(IMetaManager):
             transitions[words[i]][words[i + 1]] += 1
 
         # 生成描述
-        import random
         current_word = random.choice(words)
         result = [current_word]
 
@@ -308,7 +304,6 @@ class MetaManager(IMetaManager):
         if self.random_manager:
             template = self.random_manager.get_random_from_table('name_templates') or random.choice(templates)
         else:
-            import random
             template = random.choice(templates)
 
         # 替换参数
@@ -361,7 +356,6 @@ class MetaManager(IMetaManager):
     def save_meta_values(self, file_path: str) -> bool:
         """保存元数据值到文件。"""
         try:
-            import json
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(self.meta_values, f, ensure_ascii=False, indent=2)
             logger.info(f"Saved meta values to {file_path}")
@@ -373,7 +367,6 @@ class MetaManager(IMetaManager):
     def load_meta_values(self, file_path: str) -> bool:
         """从文件加载元数据值。"""
         try:
-            import json
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.meta_values = json.load(f)
             logger.info(f"Loaded meta values from {file_path}")
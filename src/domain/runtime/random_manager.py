@@ -4,6 +4,7 @@ ScriptRunner 的随机管理器。
 """
 
 from typing import Dict, Any, List, Optional, Union
+import json
 import random
 import re
 from .interfaces import IRandomManager
@@ -108,7 +109,6 @@ class RandomManager(IRandomManager):
             # 解析列表表达式
             if list_expr.startswith('[') and list_expr.endswith(']'):
                 # JSON风格列表
-                import json
                 items = json.loads(list_expr)
             else:
                 # 逗号分隔的字符串
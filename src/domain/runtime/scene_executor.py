@@ -68,28 +68,37 @@ class SceneExecutor(ISceneExecutor):
 
     def _initialize_scene_variables(self, scene: Dict[str, Any]):
         """初始化场景变量，包括随机范围变量和列表随机选择。"""
-        variables = scene.get('variables', {})
+        variables = scene.get('variables')
+        if not variables:
+            return
+
+        resolved = {}
         for var_name, var_value in variables.items():
             if isinstance(var_value, str):
                 # 检查是否是随机范围，如 "2-6"
                 range_match = re.match(r'^(\d+)-(\d+)$', var_value)
                 if range_match:
                     min_val, max_val = map(int, range_match.groups())
-                    actual_value = random.randint(min_val, max_val)
-                    self.state.set_variable(var_name, actual_value)
+                    resolved[var_name] = random.randint(min_val, max_val)
                 else:
                     # 直接设置为字符串值
-                    self.state.set_variable(var_name, var_value)
+                    resolved[var_name] = var_value
             elif isinstance(var_value, list):
                 # 从列表中随机选择一个值
-                actual_value = random.choice(var_value)
-                self.state.set_variable(var_name, actual_value)
+                resolved[var_name] = random.choice(var_value)
             else:
                 # 其他类型直接设置
-                self.state.set_variable(var_name, var_value)
+                resolved[var_name] = var_value
+
+        # 一次性写入状态，避免逐个调用 set_variable
+        self.state.update_variables(resolved)
 
     def _replace_variables(self, text: str) -> str:
         """替换文本中的 DSL 变量。"""
+        # 没有占位符时无需遍历变量
+        if '{' not in text:
+            return text
+
         # 从状态管理器获取所有变量
         variables = self.state.get_all_variables()
 
@@ -3,6 +3,7 @@ ScriptRunner 脚本驱动的命令执行器。
 支持在YAML脚本中定义命令行为，通过插件提供动作函数。
 """
 
+import re
 from typing import Dict, Any, List, Callable
 from .interfaces import ICommandExecutor
 from ...infrastructure.logger import get_logger
@@ -11,6 +12,16 @@ from ...infrastructure.plugin_interface import ActionPlugin
 
 logger = get_logger(__name__)
 
+# 匹配 {variable} 或 {variable.property} 格式的占位符
+_VARIABLE_PATTERN = re.compile(r'\{([^}]+)\}')
+
+# 预定义变量缺失时默认值的构造函数
+_VARIABLE_DEFAULTS = {
+    'player': dict,
+    'inventory': list,
+    'flags': list,
+}
+
 
 class ScriptCommandExecutor(ICommandExecutor):
     """脚本驱动的命令执行器，所有命令行为都在脚本中定义。"""
@@ -45,14 +56,13 @@ class ScriptCommandExecutor(ICommandExecutor):
             return messages
 
         # 获取命令类型
-        command_type = list(command.keys())[0]
-        command_value = command[command_type]
+        command_type, command_value = next(iter(command.items()))
 
         # 替换命令值中的变量占位符
         if isinstance(command_value, str):
             command_value = self._substitute_variables(command_value, None)
 
-        logger.debug(f"Executing command: {command_type} = {command_value}")
+        logger.debug("Executing command: %s = %s", command_type, command_value)
 
         try:
             # 使用脚本定义的命令
@@ -122,7 +132,9 @@ class ScriptCommandExecutor(ICommandExecutor):
 
     def _substitute_variables(self, message: str, command_value: Any) -> str:
         """替换消息中的变量占位符。"""
-        import re
+        # 没有占位符时无需替换
+        if '{' not in message:
+            return message
 
         # 替换 {value} 为 command_value
         if '{value}' in message:
@@ -141,32 +153,22 @@ class ScriptCommandExecutor(ICommandExecutor):
                     logger.warning(f"Failed to substitute variable {var_path}: {e}")
                     return f'{{{var_path}}}'
 
-        # 使用正则表达式替换所有 {variable} 或 {variable.property} 格式
-        message = re.sub(r'\{([^}]+)\}', replace_var, message)
+        # 使用预编译的正则表达式替换所有占位符
+        message = _VARIABLE_PATTERN.sub(replace_var, message)
 
         return message
 
     def _get_nested_variable(self, var_path: str) -> Any:
         """获取嵌套变量的值，支持点号访问。"""
-        parts = var_path.split('.')
-        root_var = parts[0]
-
-        # 特殊处理一些预定义变量
-        if root_var == 'player':
-            value = self.state.get_variable('player', {})
-        elif root_var == 'inventory':
-            value = self.state.get_variable('inventory', [])
-        elif root_var == 'flags':
-            value = self.state.get_variable('flags', [])
-        else:
-            value = self.state.get_variable(root_var, None)
-
-        # 如果没有更多部分，直接返回
-        if len(parts) == 1:
-            return value
+        # 不含点号的简单变量名无需拆分路径
+        if '.' not in var_path:
+            return self._get_root_variable(var_path)
+
+        root_var, *parts = var_path.split('.')
+        value = self._get_root_variable(root_var)
 
         # 遍历剩余部分
-        for part in parts[1:]:
+        for part in parts:
             if isinstance(value, dict):
                 value = value.get(part)
             elif isinstance(value, list):
@@ -181,3 +183,8 @@ class ScriptCommandExecutor(ICommandExecutor):
                 break
 
         return value
+
+    def _get_root_variable(self, name: str) -> Any:
+        """获取顶层变量，预定义变量缺失时返回对应的空值。"""
+        default_factory = _VARIABLE_DEFAULTS.get(name)
+        return self.state.get_variable(name, default_factory() if default_factory else None)
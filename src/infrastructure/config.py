@@ -7,7 +7,6 @@ import yaml
 import os
 import threading
 from typing import Dict, Any, Optional
-from pathlib import Path
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -50,9 +49,9 @@ class Config:
 
     def load(self):
         """从文件加载配置。"""
-        config_path = Path(self._config_file)
+        config_path = self._config_file
         logger.info(f"Loading configuration from: {config_path}")
-        if config_path.exists():
+        if os.path.exists(config_path):
             with open(config_path, 'r', encoding='utf-8') as f:
                 self._config = yaml.safe_load(f) or {}
             logger.debug(f"Configuration loaded with {len(self._config)} top-level keys")
@@ -111,8 +110,8 @@ class Config:
     def save(self):
         """将当前配置保存到文件。"""
         with self._lock:
-            config_path = Path(self._config_file)
-            config_path.parent.mkdir(parents=True, exist_ok=True)
+            config_path = self._config_file
+            os.makedirs(os.path.dirname(config_path) or '.', exist_ok=True)
 
             with open(config_path, 'w', encoding='utf-8') as f:
                 yaml.dump(self._config, f, default_flow_style=False, allow_unicode=True)
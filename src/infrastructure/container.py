@@ -9,25 +9,40 @@ from .logger import get_logger
 logger = get_logger(__name__)
 
 
+# 标记服务尚未从工厂创建
+_UNSET = object()
+
+
+class _Entry:
+    """容器中的注册项，保存已解析的实例或用于创建实例的工厂。"""
+
+    __slots__ = ('instance', 'factory')
+
+    def __init__(self, instance: Any = _UNSET, factory: Optional[Callable] = None):
+        self.instance = instance
+        self.factory = factory
+
+
 class Container:
     """真正的依赖注入容器，支持构造函数注入。"""
 
     def __init__(self):
-        self._services: Dict[str, Any] = {}
-        self._factories: Dict[str, Callable] = {}
-        self._types: Dict[str, Type] = {}
+        self._entries: Dict[str, _Entry] = {}
 
     def register(self, service_name: str, service: Any):
         """注册一个单例服务实例。"""
-        self._services[service_name] = service
+        self._entries[service_name] = _Entry(instance=service)
 
     def register_factory(self, service_name: str, factory: Callable):
         """注册一个工厂函数用于创建服务。"""
-        self._factories[service_name] = factory
+        self._entries[service_name] = _Entry(factory=factory)
 
     def register_type(self, service_name: str, cls: Type):
         """注册一个类型，支持自动依赖解析。"""
-        self._types[service_name] = cls
+        def factory():
+            logger.debug(f"Resolving dependencies for type {service_name}")
+            return self._resolve_dependencies(cls)
+        self.register_factory(service_name, factory)
 
     def register_class(self, service_name: str, cls: Type, *args, **kwargs):
         """注册一个类以便按需实例化。"""
@@ -38,26 +53,20 @@ class Container:
     def get(self, service_name: str) -> Any:
         """获取服务实例，如果有必要则创建它。"""
         logger.debug(f"Resolving service: {service_name}")
-        if service_name in self._services:
-            logger.debug(f"Service {service_name} found in cache")
-            return self._services[service_name]
+        entry = self._entries.get(service_name)
+        if entry is None:
+            logger.error(f"Service '{service_name}' not registered")
+            raise ValueError(f"Service '{service_name}' not registered")
 
-        if service_name in self._factories:
-            logger.debug(f"Creating service {service_name} from factory")
-            service = self._factories[service_name]()
-            # 缓存单例实例
-            self._services[service_name] = service
-            return service
-
-        if service_name in self._types:
-            logger.debug(f"Resolving dependencies for type {service_name}")
-            service = self._resolve_dependencies(self._types[service_name])
-            # 缓存单例实例
-            self._services[service_name] = service
-            return service
+        if entry.instance is not _UNSET:
+            logger.debug(f"Service {service_name} found in cache")
+            return entry.instance
 
-        logger.error(f"Service '{service_name}' not registered")
-        raise ValueError(f"Service '{service_name}' not registered")
+        logger.debug(f"Creating service {service_name} from factory")
+        service = entry.factory()
+        # 缓存单例实例
+        entry.instance = service
+        return service
 
     def resolve(self, cls: Type) -> Any:
         """解析并创建指定类型的实例，自动注入依赖。"""
@@ -79,7 +88,7 @@ class Container:
                 continue
 
             # 尝试从容器中解析依赖
-            if param_name in self._services or param_name in self._factories or param_name in self._types:
+            if param_name in self._entries:
                 kwargs[param_name] = self.get(param_name)
             else:
                 raise ValueError(f"Cannot resolve dependency '{param_name}' for {cls.__name__}")
@@ -88,15 +97,11 @@ class Container:
 
     def has(self, service_name: str) -> bool:
         """检查服务是否已注册。"""
-        return (service_name in self._services or
-                service_name in self._factories or
-                service_name in self._types)
+        return service_name in self._entries
 
     def clear(self):
         """清除所有已注册的服务（对测试有用）。"""
-        self._services.clear()
-        self._factories.clear()
-        self._types.clear()
+        self._entries.clear()
 
 
 # 移除全局容器实例，由调用方创建和管理
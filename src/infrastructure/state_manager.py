@@ -16,15 +16,22 @@ class StateManager:
         self.save_file = save_file or "game_save.json"
         self.active_effects: Dict[str, Dict[str, Any]] = {}  # DSL 效果
         self.message_queue: List[str] = []  # 广播消息队列
+        self.revision: int = 0  # 状态版本号，每次变量、标志或场景变化时递增
 
     def set_variable(self, key: str, value: Any):
         """设置游戏变量。"""
         self.variables[key] = value
+        self.revision += 1
 
     def get_variable(self, key: str, default=None):
         """获取游戏变量。"""
         return self.variables.get(key, default)
 
+    def update_variables(self, variables: Dict[str, Any]):
+        """批量设置游戏变量。"""
+        self.variables.update(variables)
+        self.revision += 1
+
     def get_all_variables(self) -> Dict[str, Any]:
         """获取所有变量。"""
         return self.variables.copy()
@@ -32,6 +39,7 @@ class StateManager:
     def set_flag(self, flag: str):
         """设置游戏标志。"""
         self.flags.add(flag)
+        self.revision += 1
 
     def has_flag(self, flag: str) -> bool:
         """检查标志是否已设置。"""
@@ -40,10 +48,16 @@ class StateManager:
     def clear_flag(self, flag: str):
         """清除游戏标志。"""
         self.flags.discard(flag)
+        self.revision += 1
 
     def set_current_scene(self, scene_id: str):
         """设置当前场景。"""
         self.current_scene = scene_id
+        self.revision += 1
+
+    def mark_changed(self):
+        """标记状态已变化。条件依赖的外部数据（如解析器中的对象状态）被就地修改后调用，使基于版本号的缓存失效。"""
+        self.revision += 1
 
     def get_current_scene(self) -> str:
         """获取当前场景。"""
@@ -94,6 +108,7 @@ class StateManager:
             self.flags = set(state.get('flags', []))
             self.current_scene = state.get('current_scene', '')
             self.active_effects = state.get('active_effects', {})
+            self.revision += 1
             return True
         return False
 
@@ -104,13 +119,14 @@ class StateManager:
         self.current_scene = ""
         self.active_effects.clear()
         self.message_queue.clear()
+        self.revision += 1
 
     def add_broadcast_message(self, message: str):
         """添加广播消息到队列。"""
         self.message_queue.append(message)
 
     def get_broadcast_messages(self) -> List[str]:
-        """获取并清空广播消息队列。"""
-        messages = self.message_queue.copy()
-        self.message_queue.clear()
+        """获取并清空广播消息队列。直接交出当前队列并换上新列表，避免复制。"""
+        messages = self.message_queue
+        self.message_queue = []
         return messages
@@ -3,7 +3,8 @@ ScriptRunner 的输入处理器。
 处理玩家的自然语言输入。
 """
 
-from typing import Dict, Any, Optional, Callable
+import functools
+from typing import Dict, Any, FrozenSet, Optional, Callable
 from ...domain.runtime.interfaces import IInputHandler
 from ...infrastructure.logger import get_logger
 from ...infrastructure.config import Config
@@ -14,6 +15,9 @@ from ...utils.exceptions import ExecutionError, GameError
 
 logger = get_logger(__name__)
 
+# 玩家输入解析结果缓存的最大条目数，超出时淘汰最早加入的条目
+_PARSE_CACHE_SIZE = 256
+
 
 class InputHandler(IInputHandler):
     """处理玩家的自然语言输入。"""
@@ -34,16 +38,22 @@ class InputHandler(IInputHandler):
         # 获取插件管理器（已由ApplicationInitializer加载）
         self.plugin_manager = self.container.get('plugin_manager')
 
+        # 动作执行上下文，首次执行动作时构建，依赖被替换时失效
+        self._action_context: Optional[Dict[str, Any]] = None
+
         # 从插件加载动作处理器
         self.action_handlers: Dict[str, Callable[[str], Dict[str, Any]]] = {}
         self._load_actions_from_plugins()
 
         # 从脚本加载组合配方（将在第一次访问parser时设置）
         self._combine_recipes = None
+        self._combine_recipe_sets: Optional[Dict[str, FrozenSet[str]]] = None
 
         # 缓存常用数据
         self._scene_cache: Dict[str, Any] = {}
         self._object_cache: Dict[str, Any] = {}
+        self._scene_object_ids: Dict[str, FrozenSet[str]] = {}
+        self._parse_cache: Dict[str, Dict[str, Any]] = {}
 
     @property
     def combine_recipes(self):
@@ -52,29 +62,40 @@ class InputHandler(IInputHandler):
             self._combine_recipes = self.config.get('game.combine_recipes', {})
         return self._combine_recipes
 
+    @property
+    def combine_recipe_sets(self) -> Dict[str, FrozenSet[str]]:
+        """获取以原料集合表示的组合配方（结果 -> 原料集合），首次访问时构建。"""
+        if self._combine_recipe_sets is None:
+            self._combine_recipe_sets = {
+                result: frozenset(ingredients) for result, ingredients in self.combine_recipes.items()
+            }
+        return self._combine_recipe_sets
+
     def _load_actions_from_plugins(self):
         """从插件加载动作处理器。"""
         action_plugins = self.plugin_manager.get_plugins_by_type(ActionPlugin)
         for plugin in action_plugins:
             actions = plugin.get_actions()
             for action_name, action_func in actions.items():
-                # 创建包装函数，为动作函数提供上下文
-                def create_wrapped_handler(action_func, action_name):
-                    def wrapped_handler(target: str) -> Dict[str, Any]:
-                        context = self._get_action_context()
-                        return action_func(target, context)
-                    return wrapped_handler
-                
-                self.action_handlers[action_name] = create_wrapped_handler(action_func, action_name)
+                # 绑定动作函数，调用时提供上下文
+                self.action_handlers[action_name] = functools.partial(self._call_plugin_action, action_func)
                 logger.info(f"Loaded action '{action_name}' from plugin '{plugin.name}'")
 
+    def _call_plugin_action(self, action_func: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                            target: str) -> Dict[str, Any]:
+        """以当前动作上下文调用插件动作函数。"""
+        return action_func(target, self._get_action_context())
+
     def _get_action_context(self) -> Dict[str, Any]:
-        """获取动作执行上下文。"""
+        """获取动作执行上下文。依赖齐全时只构建一次并在之后的动作调用中复用。"""
+        if self._action_context is not None:
+            return self._action_context
+
         state = self.state
         if not hasattr(state, 'get_variable'):
             logger.error(f"State manager is not properly initialized: {type(state)}")
             raise ExecutionError("State manager is not properly initialized")
-        return {
+        context = {
             'parser': self.parser,
             'state': state,
             'config': self.config,
@@ -84,6 +105,10 @@ class InputHandler(IInputHandler):
             'input_handler': self,
             'is_object_accessible': self._is_object_accessible,
         }
+        # 尚未注册到容器的依赖会在之后可用，缺失时不缓存，下次重新获取
+        if all(value is not None for value in context.values()):
+            self._action_context = context
+        return context
 
     @property
     def parser(self):
@@ -112,6 +137,7 @@ class InputHandler(IInputHandler):
     @event_manager.setter
     def event_manager(self, value):
         self._event_manager = value
+        self._action_context = None
 
     @property
     def condition_evaluator(self):
@@ -122,6 +148,7 @@ class InputHandler(IInputHandler):
     @condition_evaluator.setter
     def condition_evaluator(self, value):
         self._condition_evaluator = value
+        self._action_context = None
 
     @property
     def interaction_manager(self):
@@ -132,6 +159,7 @@ class InputHandler(IInputHandler):
     @interaction_manager.setter
     def interaction_manager(self, value):
         self._interaction_manager = value
+        self._action_context = None
 
     @property
     def action_executor(self):
@@ -139,6 +167,11 @@ class InputHandler(IInputHandler):
             self._action_executor = self.container.get('action_executor')
         return self._action_executor
 
+    @action_executor.setter
+    def action_executor(self, value):
+        self._action_executor = value
+        self._action_context = None
+
     def process_player_input(self, input_text: str) -> Dict[str, Any]:
         """
         处理玩家的自然语言输入并返回结果。
@@ -152,16 +185,16 @@ class InputHandler(IInputHandler):
         Raises:
             GameError: 当输入处理失败时抛出
         """
-        logger.debug(f"Processing player input: {input_text}")
+        logger.debug("Processing player input: %s", input_text)
         start_time = logger.isEnabledFor(10)  # DEBUG level
 
         try:
             # 解析输入
-            parsed_command = self.parser.parse_player_command(input_text)
+            parsed_command = self._parse_command(input_text)
             action = parsed_command.get('action', 'unknown')
             target = parsed_command.get('target')
 
-            logger.debug(f"Parsed action: {action}, target: {target}")
+            logger.debug("Parsed action: %s, target: %s", action, target)
 
             # 验证动作
             if action == 'unknown':
@@ -186,7 +219,7 @@ class InputHandler(IInputHandler):
             if result['success'] and self.event_manager:
                 try:
                     self.event_manager.trigger_player_action(action, target=target)
-                    logger.debug(f"Triggered event for action: {action}")
+                    logger.debug("Triggered event for action: %s", action)
                 except Exception as e:
                     logger.warning(f"Failed to trigger event for action {action}: {e}")
 
@@ -220,6 +253,16 @@ class InputHandler(IInputHandler):
                 'original_input': input_text
             }
 
+    def _parse_command(self, input_text: str) -> Dict[str, Any]:
+        """解析玩家输入，相同输入复用缓存的解析结果（只读）。"""
+        parsed_command = self._parse_cache.get(input_text)
+        if parsed_command is None:
+            parsed_command = self.parser.parse_player_command(input_text)
+            if len(self._parse_cache) >= _PARSE_CACHE_SIZE:
+                del self._parse_cache[next(iter(self._parse_cache))]
+            self._parse_cache[input_text] = parsed_command
+        return parsed_command
+
     def _execute_action(self, action: str, target: str) -> Dict[str, Any]:
         """
         执行特定动作。
@@ -234,7 +277,7 @@ class InputHandler(IInputHandler):
         Raises:
             ExecutionError: 当动作执行失败时抛出
         """
-        logger.debug(f"Executing action: {action} with target: {target}")
+        logger.debug("Executing action: %s with target: %s", action, target)
 
         # 首先检查是否是玩家命令映射到脚本命令
         player_command = self.parser.get_player_command(action)
@@ -250,13 +293,13 @@ class InputHandler(IInputHandler):
 
         try:
             result = handler(target)
-            logger.debug(f"Action {action} executed with result: success={result['success']}")
+            logger.debug("Action %s executed with result: success=%s", action, result['success'])
 
             # 如果有action_executor且有actions，执行它们
             if self.action_executor and result.get('actions'):
                 try:
                     self.action_executor.execute_actions(result['actions'])
-                    logger.debug(f"Executed {len(result['actions'])} additional actions for {action}")
+                    logger.debug("Executed %d additional actions for %s", len(result['actions']), action)
                 except Exception as e:
                     logger.error(f"Error executing additional actions for {action}: {e}")
                     raise ExecutionError(f"执行动作 '{action}' 的附加操作时出错") from e
@@ -332,19 +375,20 @@ class InputHandler(IInputHandler):
         if not current_scene_id:
             return False
 
-        scene = self._get_cached_scene(current_scene_id)
-        if not scene:
-            return False
-
-        # 检查场景中的对象列表
-        objects_in_scene = scene.get('objects', [])
-        for obj_ref in objects_in_scene:
-            if isinstance(obj_ref, dict) and obj_ref.get('ref') == obj_id:
-                return True
-            elif isinstance(obj_ref, str) and obj_ref == obj_id:
-                return True
-
-        return False
+        return obj_id in self._get_scene_object_ids(current_scene_id)
+
+    def _get_scene_object_ids(self, scene_id: str) -> FrozenSet[str]:
+        """获取场景中引用的对象ID集合，首次访问场景时构建并缓存。"""
+        object_ids = self._scene_object_ids.get(scene_id)
+        if object_ids is None:
+            scene = self._get_cached_scene(scene_id)
+            object_ids = frozenset(
+                obj_ref.get('ref') if isinstance(obj_ref, dict) else obj_ref
+                for obj_ref in (scene.get('objects', []) if scene else [])
+                if isinstance(obj_ref, (dict, str))
+            )
+            self._scene_object_ids[scene_id] = object_ids
+        return object_ids
 
     def _execute_script_command(self, script_command_name: str, player_command: Dict[str, Any], target: str) -> Dict[str, Any]:
         """
@@ -358,7 +402,7 @@ class InputHandler(IInputHandler):
         Returns:
             执行结果字典
         """
-        logger.debug(f"Executing script command: {script_command_name} with player_command: {player_command}")
+        logger.debug("Executing script command: %s with player_command: %s", script_command_name, player_command)
 
         # 获取脚本命令定义
         script_command = self.parser.get_command(script_command_name)
@@ -378,7 +422,7 @@ class InputHandler(IInputHandler):
         if '{target}' in command_value:
             command_value = command_value.replace('{target}', target or '')
         if '{target_description}' in command_value:
-            obj = self.parser.get_object(target) if target else None
+            obj = self._get_cached_object(target) if target else None
             description = obj.get('description', f'一个{target}') if obj else '这里什么都没有'
             command_value = command_value.replace('{target_description}', description)
         if '{inventory_list}' in command_value:
@@ -3,6 +3,7 @@ ScriptRunner 表达式评估器工具模块。
 提供安全的数学和逻辑表达式评估功能。
 """
 
+import random
 from typing import Any, Dict
 from ..infrastructure.logger import get_logger
 
@@ -51,7 +52,6 @@ class ExpressionEvaluator:
                 safe_context[k] = v
 
         # 为掷骰子和类似机制添加随机功能
-        import random
         safe_context['random'] = random.randint
 
         # 定义安全的内置函数
@@ -0,0 +1,55 @@
+"""
+Unit tests for ActionExecutor.
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.domain.runtime.action_executor import ActionExecutor
+
+
+class TestActionExecutor:
+    def setup_method(self):
+        """设置测试方法。"""
+        self.mock_state_manager = Mock()
+        self.mock_command_executor = Mock()
+        self.executor = ActionExecutor(
+            self.mock_state_manager,
+            self.mock_command_executor
+        )
+
+    def test_set_action(self):
+        """测试变量赋值动作交给命令执行器。"""
+        self.executor.execute_action('set: health=100')
+        self.mock_command_executor.execute_command.assert_called_with({'set': 'health=100'})
+
+    def test_add_flag_action(self):
+        """测试设置标志动作。"""
+        self.executor.execute_action('add_flag:has_key')
+        self.mock_state_manager.set_flag.assert_called_with('has_key')
+
+    def test_remove_and_clear_flag_actions(self):
+        """测试清除标志动作的两种写法。"""
+        self.executor.execute_action('remove_flag:has_key')
+        self.mock_state_manager.clear_flag.assert_called_with('has_key')
+
+        self.executor.execute_action('clear_flag:door_open')
+        self.mock_state_manager.clear_flag.assert_called_with('door_open')
+
+    def test_broadcast_action(self):
+        """测试广播动作去除引号。"""
+        self.executor.execute_action('broadcast:"门开了"')
+        self.mock_state_manager.add_broadcast_message.assert_called_with('门开了')
+
+    def test_unknown_action(self):
+        """测试未知动作不会修改状态。"""
+        self.executor.execute_action('unknown_action:value')
+        self.executor.execute_action('no_separator')
+        self.mock_command_executor.execute_command.assert_not_called()
+        self.mock_state_manager.set_flag.assert_not_called()
+
+    def test_repeated_action(self):
+        """测试相同动作字符串可重复执行，参数去除首尾空白。"""
+        self.executor.execute_action('add_flag: has_key ')
+        self.executor.execute_action('add_flag: has_key ')
+        self.mock_state_manager.set_flag.assert_called_with('has_key')
+        assert self.mock_state_manager.set_flag.call_count == 2
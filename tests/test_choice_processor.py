@@ -0,0 +1,50 @@
+"""
+Unit tests for ChoiceProcessor.
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.domain.runtime.choice_processor import ChoiceProcessor
+from src.infrastructure.state_manager import StateManager
+
+
+class TestChoiceProcessor:
+    def setup_method(self):
+        """设置测试方法。"""
+        self.state = StateManager()
+        self.state.set_current_scene('hall')
+        self.mock_parser = Mock()
+        self.mock_parser.get_scene.return_value = {'choices': [
+            {'text': '离开', 'next': 'outside'},
+            {'text': '开门', 'next': 'room', 'condition': 'has_flag(has_key)'},
+        ]}
+        self.mock_condition_evaluator = Mock()
+        self.mock_condition_evaluator.evaluate_condition.side_effect = lambda condition: self.state.has_flag('has_key')
+        self.processor = ChoiceProcessor(self.mock_parser, self.state, Mock(), self.mock_condition_evaluator)
+
+    def test_available_choices_reused_until_state_changes(self):
+        """测试状态未变化时复用可用选择，状态变化后重新评估。"""
+        assert [choice['next'] for choice in self.processor.get_available_choices()] == ['outside']
+        self.processor.get_available_choices()
+        assert self.mock_condition_evaluator.evaluate_condition.call_count == 1
+
+        self.state.set_flag('has_key')
+        assert [choice['next'] for choice in self.processor.get_available_choices()] == ['outside', 'room']
+        assert self.mock_condition_evaluator.evaluate_condition.call_count == 2
+
+    def test_available_choices_invalidated_by_mark_changed(self):
+        """测试外部数据被就地修改并标记状态变化后重新评估。"""
+        self.processor.get_available_choices()
+        self.state.flags.add('has_key')  # 绕过版本号的修改
+        assert len(self.processor.get_available_choices()) == 1
+
+        self.state.mark_changed()
+        assert len(self.processor.get_available_choices()) == 2
+
+    def test_available_choices_returns_copy(self):
+        """测试调用方修改返回的列表不会影响缓存结果。"""
+        choices = self.processor.get_available_choices()
+        choices.append({'text': '伪造', 'next': 'nowhere'})
+        cached = self.processor.get_available_choices()
+        cached.clear()
+        assert [choice['next'] for choice in self.processor.get_available_choices()] == ['outside']
@@ -322,3 +322,17 @@ class TestCommandExecutor:
         command = {}
         messages = self.executor.execute_command(command)
         assert messages == []
+
+    def test_get_nested_variable(self):
+        """测试获取简单变量和点号路径变量。"""
+        variables = {'gold': 5, 'player': {'health': 80}, 'inventory': [{'name': 'sword'}]}
+        self.mock_state_manager.get_variable.side_effect = lambda name, default=None: variables.get(name, default)
+
+        assert self.executor._get_nested_variable('gold') == 5
+        assert self.executor._get_nested_variable('player.health') == 80
+        assert self.executor._get_nested_variable('inventory.0.name') == 'sword'
+        assert self.executor._get_nested_variable('inventory.5.name') is None
+        assert self.executor._get_nested_variable('missing') is None
+
+        variables.clear()
+        assert self.executor._get_nested_variable('flags') == []
@@ -0,0 +1,132 @@
+"""
+Unit tests for ConditionEvaluator.
+"""
+
+import pytest
+from unittest.mock import Mock
+from src.infrastructure.state_manager import StateManager
+from src.domain.runtime.condition_evaluator import ConditionEvaluator
+
+
+class TestConditionEvaluator:
+    def setup_method(self):
+        """设置测试方法。"""
+        self.state_manager = StateManager()
+        self.evaluator = ConditionEvaluator(self.state_manager)
+
+    def test_empty_condition(self):
+        """测试空条件始终为真。"""
+        assert self.evaluator.evaluate_condition(None) is True
+        assert self.evaluator.evaluate_condition('') is True
+
+    def test_equality(self):
+        """测试相等比较。"""
+        self.state_manager.set_variable('weather', 'rain')
+        assert self.evaluator.evaluate_condition('weather == "rain"') is True
+        assert self.evaluator.evaluate_condition('weather == "sun"') is False
+
+    def test_typed_equality(self):
+        """测试数值和布尔字面量按类型比较，其他值按字符串比较。"""
+        self.state_manager.set_variable('gold', 5.0)
+        self.state_manager.set_variable('door_open', True)
+        self.state_manager.set_variable('answer', '42')
+        assert self.evaluator.evaluate_condition('gold == 5') is True
+        assert self.evaluator.evaluate_condition('gold == 6') is False
+        assert self.evaluator.evaluate_condition('door_open == true') is True
+        assert self.evaluator.evaluate_condition('door_open == false') is False
+        assert self.evaluator.evaluate_condition('answer == 42') is True
+        assert self.evaluator.evaluate_condition('answer == "42"') is True
+
+    def test_numeric_comparisons(self):
+        """测试数值比较。"""
+        self.state_manager.set_variable('health', 50)
+        assert self.evaluator.evaluate_condition('health >= 50') is True
+        assert self.evaluator.evaluate_condition('health <= 49') is False
+        assert self.evaluator.evaluate_condition('health > 10') is True
+        assert self.evaluator.evaluate_condition('health < 10') is False
+
+    def test_comparison_between_variables(self):
+        """测试两侧均为变量的比较。"""
+        self.state_manager.set_variable('gold', 30)
+        self.state_manager.set_variable('cost', 25)
+        assert self.evaluator.evaluate_condition('gold >= cost') is True
+
+        self.state_manager.set_variable('cost', 40)
+        assert self.evaluator.evaluate_condition('gold >= cost') is False
+
+    def test_nested_variable(self):
+        """测试点表示法访问嵌套变量。"""
+        self.state_manager.set_variable('player', {'health': 80})
+        assert self.evaluator.evaluate_condition('player.health > 50') is True
+
+    def test_flags_and_items(self):
+        """测试标志、否定和物品检查。"""
+        self.state_manager.set_flag('has_key')
+        self.state_manager.set_variable('inventory', ['sword'])
+        assert self.evaluator.evaluate_condition('has_flag("has_key")') is True
+        assert self.evaluator.evaluate_condition('!has_key') is False
+        assert self.evaluator.evaluate_condition('has_item(sword)') is True
+        assert self.evaluator.evaluate_condition('has_item(shield)') is False
+
+    def test_not_operator(self):
+        """测试 not 取反子条件。"""
+        self.state_manager.set_flag('has_sword')
+        assert self.evaluator.evaluate_condition("not has_flag('has_sword')") is False
+        assert self.evaluator.evaluate_condition("not has_flag('has_key')") is True
+
+    def test_logical_operators(self):
+        """测试逻辑运算符。"""
+        self.state_manager.set_flag('a')
+        assert self.evaluator.evaluate_condition('has_flag(a) and has_flag(b)') is False
+        assert self.evaluator.evaluate_condition('has_flag(a) or has_flag(b)') is True
+
+    def test_logical_operator_precedence(self):
+        """测试 and 的优先级高于 or。"""
+        self.state_manager.set_flag('a')
+        assert self.evaluator.evaluate_condition('has_flag(a) or has_flag(b) and has_flag(c)') is True
+        assert self.evaluator.evaluate_condition('has_flag(b) and has_flag(c) or has_flag(a)') is True
+        assert self.evaluator.evaluate_condition('has_flag(b) or has_flag(c) and has_flag(a)') is False
+
+    def test_logical_keyword_inside_quotes(self):
+        """测试引号内的 and/or 不会拆分条件。"""
+        self.state_manager.set_variable('game', 'command and conquer')
+        assert self.evaluator.evaluate_condition('game == "command and conquer"') is True
+        assert self.evaluator.evaluate_condition('game == "rock or roll"') is False
+
+    def test_compiled_condition_reflects_state_changes(self):
+        """测试缓存的已编译条件读取最新状态。"""
+        self.state_manager.set_variable('gold', 5)
+        assert self.evaluator.evaluate_condition('gold > 10') is False
+
+        self.state_manager.set_variable('gold', 20)
+        assert self.evaluator.evaluate_condition('gold > 10') is True
+        assert 'gold > 10' in self.evaluator._compiled
+
+    def test_compile_condition(self):
+        """测试预编译的谓词复用缓存并读取最新状态。"""
+        predicate = self.evaluator.compile_condition('gold > 10')
+        assert predicate is self.evaluator.compile_condition('gold > 10')
+
+        self.state_manager.set_variable('gold', 5)
+        assert predicate() is False
+        self.state_manager.set_variable('gold', 20)
+        assert predicate() is True
+
+    def test_object_state(self):
+        """测试对象状态检查读取当前场景中已生成对象的状态。"""
+        parser = Mock()
+        door_state = {'name': 'open', 'value': False}
+        parser.get_scene_object_entries.return_value = [{'ref': 'door', 'spawn_condition': 'has_flag(lit)'}]
+        parser.get_object_state.side_effect = lambda obj, name: door_state if name == 'open' else None
+        evaluator = ConditionEvaluator(self.state_manager, parser)
+        self.state_manager.set_current_scene('hall')
+
+        assert evaluator.evaluate_condition('door.present') is False
+
+        self.state_manager.set_flag('lit')
+        assert evaluator.evaluate_condition('door.present') is True
+        assert evaluator.evaluate_condition('door.open') is False
+        assert evaluator.evaluate_condition('door.locked') is False
+
+        door_state['value'] = True
+        assert evaluator.evaluate_condition('door.open') is True
@@ -43,6 +43,17 @@ class TestEffectsManager:
         assert 'poisoned' in self.manager.active_effects
         assert self.manager.active_effects['poisoned']['duration'] == 5
 
+    def test_apply_effect_normalizes_actions(self):
+        """测试应用效果时将动作规范化为列表。"""
+        effect_data = {'duration': 5, 'apply': 'add_flag:poisoned', 'remove': None}
+        self.mock_parser.get_effect.return_value = effect_data
+        self.manager.apply_effect('poisoned')
+        effect = self.manager.active_effects['poisoned']
+        assert effect['apply'] == ['add_flag:poisoned']
+        assert effect['remove'] == []
+        assert effect_data['apply'] == 'add_flag:poisoned'
+        self.mock_state_manager.set_flag.assert_called_with('poisoned')
+
     def test_apply_effect_refresh(self):
         """测试刷新已存在效果。"""
         effect_data = {'duration': 5}
@@ -52,6 +63,18 @@ class TestEffectsManager:
         assert result is True
         assert self.manager.active_effects['poisoned']['duration'] == 5
 
+    def test_apply_effect_reuses_template(self):
+        """测试重复应用同一效果时复用已规范化的模板。"""
+        self.mock_parser.get_effect.return_value = {'duration': '4 turns'}
+        self.manager.apply_effect('blessed')
+        self.manager.active_effects['blessed']['duration'] = 1
+        self.manager.apply_effect('blessed')
+        assert self.manager.active_effects['blessed']['duration'] == 4
+        self.manager.remove_effect('blessed')
+        self.manager.apply_effect('blessed', 'enemy')
+        assert self.manager.active_effects['blessed']['target'] == 'enemy'
+        self.mock_parser.get_effect.assert_called_once_with('blessed')
+
     def test_apply_effect_string_duration(self):
         """测试字符串持续时间。"""
         effect_data = {'duration': '10 turns'}
@@ -79,6 +102,61 @@ class TestEffectsManager:
         self.manager.update_effects()
         assert 'temporary' not in self.manager.active_effects
 
+    @patch('time.time', return_value=1000)
+    def test_update_effects_tick_applies_effect(self, mock_time):
+        """测试tick动作在更新过程中应用新效果。"""
+        self.mock_parser.get_effect.return_value = {'duration': 2}
+        self.manager.active_effects['spreading'] = {
+            'duration': 5,
+            'tick': 'spawn',
+            'start_time': 995,
+        }
+        self.manager._compiled_actions['spawn'] = (
+            lambda argument, effect_data: self.manager.apply_effect('poisoned'), 'spawn'
+        )
+        self.manager.update_effects()
+        assert 'poisoned' in self.manager.active_effects
+
+    @patch('time.time', return_value=1000)
+    def test_update_effects_batches_health_writes(self, mock_time):
+        """测试同一轮更新中的多个生命值tick只写回一次玩家数据。"""
+        self.mock_state_manager.get_variable.return_value = {'health': 100}
+        self.manager.active_effects = {
+            'poison': {'duration': 5, 'tick': 'player.health -= 5', 'start_time': 995},
+            'burn': {'duration': 5, 'tick': 'player.health -= 3', 'start_time': 995},
+            'regen': {'duration': 5, 'tick': 'player.health += 2', 'start_time': 995},
+        }
+        self.manager.update_effects()
+        player_writes = [c for c in self.mock_state_manager.set_variable.call_args_list if c[0][0] == 'player']
+        assert len(player_writes) == 1
+        assert player_writes[0][0][1] == {'health': 94}
+
+    @patch('time.time', return_value=1000)
+    def test_update_effects_tick_rate(self, mock_time):
+        """测试按tick间隔计算已经过的tick数。"""
+        self.manager.active_effects['slow_regen'] = {
+            'duration': 5,
+            'tick': 'add_flag:regenerating',
+            'tick_rate': 2,
+            'start_time': 995,
+            'last_tick': 2,
+        }
+        self.manager.update_effects()
+        self.mock_state_manager.set_flag.assert_not_called()
+
+        self.manager.active_effects['slow_regen']['start_time'] = 993
+        self.manager.update_effects()
+        self.mock_state_manager.set_flag.assert_called_once_with('regenerating')
+        assert self.manager.active_effects['slow_regen']['last_tick'] == 3
+
+    @patch('time.time', return_value=1000)
+    def test_update_effects_without_tick_skips_clock(self, mock_time):
+        """测试没有tick动作时不读取当前时间。"""
+        self.manager.active_effects['blessed'] = {'duration': 3}
+        self.manager.update_effects()
+        mock_time.assert_not_called()
+        assert self.manager.active_effects['blessed']['duration'] == 2
+
     @patch('time.time', return_value=1000)
     def test_update_effects_tick(self, mock_time):
         """测试更新效果的tick动作。"""
@@ -101,6 +179,12 @@ class TestEffectsManager:
         assert 'poisoned' in effects
         assert 'blessed' in effects
 
+        # 未过滤时返回只读视图，反映后续变化
+        with pytest.raises(TypeError):
+            effects['cursed'] = {}
+        self.manager.active_effects['cursed'] = {}
+        assert 'cursed' in effects
+
     def test_get_active_effects_filtered(self):
         """测试获取过滤后的活跃效果。"""
         self.manager.active_effects = {
@@ -111,6 +195,41 @@ class TestEffectsManager:
         assert len(effects) == 1
         assert 'poisoned' in effects
 
+    def test_filtered_effects_follow_apply_and_remove(self):
+        """测试按目标过滤的效果在应用和移除效果后更新。"""
+        self.mock_parser.get_effect.return_value = {'duration': 3, 'modifiers': {'damage': 2}}
+        self.manager.apply_effect('rage', 'enemy')
+        assert self.manager.get_active_effects('enemy').keys() == {'rage'}
+        assert self.manager.get_effect_modifier('damage', 'enemy') == 2.0
+
+        self.manager.apply_effect('blessed')
+        assert self.manager.get_active_effects('player').keys() == {'blessed'}
+        assert self.manager.get_effect_modifier('damage', 'player') == 2.0
+
+        self.manager.remove_effect('rage')
+        assert self.manager.get_active_effects('enemy') == {}
+        assert self.manager.get_effect_modifier('damage', 'enemy') == 0.0
+
+    def test_filtered_effects_follow_direct_writes(self):
+        """测试直接写入 active_effects 的效果（增删或修改目标）也会反映在按目标的查询中。"""
+        self.mock_parser.get_effect.return_value = {'duration': 3, 'modifiers': {'strength': 2}}
+        self.manager.apply_effect('a')
+        assert self.manager.get_effect_modifier('strength', 'player') == 2.0
+
+        self.manager.active_effects['b'] = {'target': 'player', 'modifiers': {'strength': 2}}
+        assert self.manager.get_active_effects('player').keys() == {'a', 'b'}
+        assert self.manager.get_effect_modifier('strength', 'player') == 4.0
+        assert self.manager.get_effect_modifier('strength') == 4.0
+
+        del self.manager.active_effects['a']
+        self.manager.active_effects['c'] = {'target': 'orc'}
+        assert self.manager.get_active_effects('player').keys() == {'b'}
+        assert self.manager.get_active_effects('orc').keys() == {'c'}
+
+        self.manager.active_effects['b']['target'] = 'goblin'
+        assert self.manager.get_active_effects('player') == {}
+        assert self.manager.get_effect_modifier('strength', 'goblin') == 2.0
+
     def test_has_effect_true(self):
         """测试检查拥有效果。"""
         self.manager.active_effects = {'poisoned': {'target': 'player'}}
@@ -121,6 +240,13 @@ class TestEffectsManager:
         self.manager.active_effects = {'blessed': {'target': 'player'}}
         assert self.manager.has_effect('poisoned', 'player') is False
 
+    def test_has_effect_target(self):
+        """测试按目标检查效果。"""
+        self.manager.active_effects = {'poisoned': {'target': 'enemy'}}
+        assert self.manager.has_effect('poisoned') is True
+        assert self.manager.has_effect('poisoned', 'enemy') is True
+        assert self.manager.has_effect('poisoned', 'player') is False
+
     def test_get_effect_modifier_additive(self):
         """测试获取加法修正值。"""
         self.manager.active_effects = {
@@ -138,6 +264,37 @@ class TestEffectsManager:
         modifier = self.manager.get_effect_modifier('strength')
         assert modifier == 1.5  # Multiplicative modifier returns the multiplier value
 
+    def test_get_effect_modifier_mixed_order_independent(self):
+        """测试加法与乘法修正混合时结果与顺序无关。"""
+        self.manager.active_effects = {
+            'blessing': {'modifiers': {'strength': '*1.5'}},
+            'strength_buff': {'modifiers': {'strength': '+2'}},
+            'training': {'modifiers': {'strength': 2}},
+        }
+        assert self.manager.get_effect_modifier('strength') == 6.0
+
+        self.manager.active_effects = dict(reversed(list(self.manager.active_effects.items())))
+        assert self.manager.get_effect_modifier('strength') == 6.0
+        assert self.manager.get_effect_modifier('defense') == 0.0
+
+    def test_get_effect_modifier_cancelling_additive(self):
+        """测试加法修正相互抵消时仍按加法结果计算，而不是退回只有乘数的结果。"""
+        self.manager.active_effects = {
+            'buff': {'modifiers': {'strength': '+2'}},
+            'curse': {'modifiers': {'strength': '-2'}},
+            'blessing': {'modifiers': {'strength': '*1.5'}},
+        }
+        assert self.manager.get_effect_modifier('strength') == 0.0
+
+    def test_apply_effect_parses_modifiers(self):
+        """测试应用效果时预先解析修正值。"""
+        self.mock_parser.get_effect.return_value = {'duration': 3, 'modifiers': {'damage': 3, 'speed': '*0.5'}}
+        self.manager.apply_effect('strength_buff')
+        effect = self.manager.active_effects['strength_buff']
+        assert effect['_mod_add'] == {'damage': 3.0}
+        assert effect['_mod_mul'] == {'speed': 0.5}
+        assert self.manager.get_effect_modifier('damage', 'player') == 3.0
+
     def test_execute_effect_actions_list(self):
         """测试执行效果动作列表。"""
         effect_data = {'apply': ['set:health=100', 'add_flag:invincible']}
@@ -157,6 +314,16 @@ class TestEffectsManager:
         self.manager._execute_single_action('player.health -= 5', {})
         self.mock_state_manager.set_variable.assert_called_with('player', {'health': 95})
 
+    def test_execute_single_action_health_heal(self):
+        """测试执行生命值恢复动作，重复动作只解析一次。"""
+        self.mock_state_manager.get_variable.return_value = {'health': 50}
+        self.manager._execute_single_action('player.health += 10', {})
+        self.mock_state_manager.set_variable.assert_called_with('player', {'health': 60})
+        self.manager._execute_single_action('player.health += 10', {})
+        self.mock_state_manager.set_variable.assert_called_with('player', {'health': 70})
+        assert len(self.manager._compiled_actions) == 1
+        assert self.manager._compiled_actions['player.health += 10'][1] == 10
+
     def test_execute_single_action_set(self):
         """测试执行设置动作。"""
         self.manager._execute_single_action('set:strength=15', {})
@@ -193,3 +360,14 @@ class TestEffectsManager:
         message = self.manager.get_status_message()
         assert 'poisoned' in message
         assert 'blessed' in message
+
+    def test_get_status_message_follows_effect_changes(self):
+        """测试状态消息反映效果增删以及直接加入的效果。"""
+        self.mock_parser.get_effect.return_value = {'duration': 5}
+        self.manager.apply_effect('poisoned')
+        assert self.manager.get_status_message() == '效果: poisoned'
+
+        self.manager.active_effects['blessed'] = {}
+        assert self.manager.get_status_message() == '效果: poisoned, blessed'
+        self.manager.remove_effect('poisoned')
+        assert self.manager.get_status_message() == '效果: blessed'
@@ -56,6 +56,18 @@ class TestEventManager:
             self.manager.check_scheduled_events()
         self.mock_state_manager.set_variable.assert_called_with('werewolf_spawned', True)
 
+    def test_check_scheduled_events_chance(self):
+        """测试只有几率小于 1 的定时事件才会掷骰。"""
+        self.manager.scheduled_events = [
+            {'trigger': 'time > 100', 'action': 'broadcast:always'},
+            {'trigger': 'time > 100', 'action': 'broadcast:rare', 'chance': 0.1},
+        ]
+        self.mock_state_manager.get_variable.return_value = 150
+        with patch('random.random', return_value=0.5) as mock_random:
+            self.manager.check_scheduled_events()
+        assert mock_random.call_count == 1
+        self.mock_state_manager.add_broadcast_message.assert_called_once_with('always')
+
     def test_check_scheduled_events_no_trigger(self):
         """测试检查定时事件无触发。"""
         self.manager.scheduled_events = [{'trigger': 'time > 200', 'action': 'spawn_werewolf'}]
@@ -63,6 +75,22 @@ class TestEventManager:
         self.manager.check_scheduled_events()
         self.mock_state_manager.set_variable.assert_not_called()
 
+    def test_scheduled_events_follow_list_changes(self):
+        """测试追加或修改定时事件后立即生效，时间触发器只解析一次。"""
+        event = {'trigger': 'time > 200', 'action': 'broadcast:late'}
+        self.manager.scheduled_events = [event]
+        self.mock_state_manager.get_variable.return_value = 150
+        self.manager.check_scheduled_events()
+        self.mock_state_manager.add_broadcast_message.assert_not_called()
+
+        event['trigger'] = 'time > 100'
+        self.manager.scheduled_events.append({'trigger': 'health <= 0', 'action': 'broadcast:dead'})
+        self.manager.scheduled_events.append({'trigger': 'time > 100', 'action': 'broadcast:early'})
+        self.manager.check_scheduled_events()
+        assert [c.args[0] for c in self.mock_state_manager.add_broadcast_message.call_args_list] == ['late', 'early']
+        assert self.manager._compiled_time_triggers['health <= 0'] is None
+        assert self.manager._compiled_time_triggers['time > 100'][1] == 100.0
+
     def test_check_reactive_events_player_action(self):
         """测试检查反应事件玩家动作。"""
         self.manager.reactive_events = [{
@@ -84,45 +112,101 @@ class TestEventManager:
         self.manager.check_reactive_events('player_action', action='take')
         # No actions should be executed
 
-    def test_check_time_trigger_greater(self):
+    def test_reactive_index_candidates(self):
+        """测试反应事件按玩家动作索引，世界触发器事件按原有顺序保留为候选。"""
+        take = {'trigger': 'player.action = take', 'actions': []}
+        drop = {'trigger': 'player.action = drop', 'actions': []}
+        night = {'trigger': 'world.time = night', 'actions': []}
+        self.manager.reactive_events = [take, night, drop]
+
+        def events(candidates):
+            return [event for event, _ in candidates]
+
+        assert events(self.manager._get_reactive_candidates('player_action', {'action': 'take'})) == [take, night]
+        assert events(self.manager._get_reactive_candidates('player_action', {'action': 'look'})) == [night]
+        assert events(self.manager._get_reactive_candidates('scene_change', {})) == [night]
+
+        late = {'trigger': 'player.action = take', 'actions': []}
+        self.manager.reactive_events = [night, drop, late]
+        assert events(self.manager._get_reactive_candidates('player_action', {'action': 'take'})) == [night, late]
+
+    def test_check_reactive_events_uses_compiled_conditions(self):
+        """测试反应事件条件在建立索引时编译一次，触发时调用已编译谓词。"""
+        self.mock_condition_evaluator.compile_condition.side_effect = lambda condition: lambda: condition == 'ok'
+        self.manager.reactive_events = [
+            {'trigger': 'player.action = take', 'conditions': ['ok'], 'actions': ['add_flag:taken']},
+            {'trigger': 'player.action = take', 'conditions': ['ok', 'blocked'], 'actions': ['add_flag:never']},
+        ]
+        self.manager.check_reactive_events('player_action', action='take')
+        self.manager.check_reactive_events('player_action', action='take')
+
+        assert self.mock_condition_evaluator.compile_condition.call_count == 3
+        self.mock_state_manager.set_flag.assert_called_with('taken')
+        assert self.mock_state_manager.set_flag.call_count == 2
+
+    def _time_trigger_fires(self, trigger, game_time):
+        """按已解析的时间触发器判断是否触发。"""
+        compare, threshold = self.manager._get_time_trigger(trigger)
+        return compare(game_time, threshold)
+
+    def test_time_trigger_greater(self):
         """测试时间触发大于条件。"""
-        assert self.manager._check_time_trigger('time > 100', 150) is True
-        assert self.manager._check_time_trigger('time > 100', 50) is False
+        assert self._time_trigger_fires('time > 100', 150) is True
+        assert self._time_trigger_fires('time > 100', 50) is False
 
-    def test_check_time_trigger_greater_equal(self):
+    def test_time_trigger_greater_equal(self):
         """测试时间触发大于等于条件。"""
-        assert self.manager._check_time_trigger('time >= 100', 100) is True
-        assert self.manager._check_time_trigger('time >= 100', 50) is False
+        assert self._time_trigger_fires('time >= 100', 100) is True
+        assert self._time_trigger_fires('time >= 100', 50) is False
 
-    def test_check_time_trigger_less(self):
+    def test_time_trigger_less(self):
         """测试时间触发小于条件。"""
-        assert self.manager._check_time_trigger('time < 100', 50) is True
-        assert self.manager._check_time_trigger('time < 100', 150) is False
+        assert self._time_trigger_fires('time < 100', 50) is True
+        assert self._time_trigger_fires('time < 100', 150) is False
 
-    def test_check_time_trigger_less_equal(self):
+    def test_time_trigger_less_equal(self):
         """测试时间触发小于等于条件。"""
-        assert self.manager._check_time_trigger('time <= 100', 100) is True
-        assert self.manager._check_time_trigger('time <= 100', 150) is False
+        assert self._time_trigger_fires('time <= 100', 100) is True
+        assert self._time_trigger_fires('time <= 100', 150) is False
+
+    def test_time_trigger_invalid(self):
+        """测试非时间触发器或无效阈值不会被解析。"""
+        assert self.manager._get_time_trigger('health <= 0') is None
+        assert self.manager._get_time_trigger('time > soon') is None
 
     def test_matches_trigger_player_action(self):
         """测试匹配触发器玩家动作。"""
         assert self.manager._matches_trigger('player.action = take', 'player_action', {'action': 'take'}) is True
         assert self.manager._matches_trigger('player.action = drop', 'player_action', {'action': 'take'}) is False
 
+    def test_matches_trigger_parses_once(self):
+        """测试反应触发器只解析一次并缓存。"""
+        self.manager._matches_trigger('player.action = "take"', 'player_action', {'action': 'take'})
+        assert self.manager._compiled_triggers['player.action = "take"'] == ('player_action', 'take', None)
+        assert self.manager._matches_trigger('player.action = "take"', 'scene_change', {'action': 'take'}) is False
+
     def test_matches_trigger_world_property(self):
         """测试匹配触发器世界属性。"""
         self.mock_state_manager.get_variable.return_value = 'night'
         assert self.manager._matches_trigger('world.time = night', 'world_change', {}) is True
 
-    def test_check_conditions_all_true(self):
-        """测试检查条件全部为真。"""
-        self.mock_condition_evaluator.evaluate_condition.return_value = True
-        assert self.manager._check_conditions(['cond1', 'cond2']) is True
-
-    def test_check_conditions_some_false(self):
-        """测试检查条件部分为假。"""
-        self.mock_condition_evaluator.evaluate_condition.side_effect = [True, False]
-        assert self.manager._check_conditions(['cond1', 'cond2']) is False
+    def test_reactive_conditions_all_true(self):
+        """测试反应事件条件全部为真时执行动作。"""
+        self.mock_condition_evaluator.compile_condition.return_value = lambda: True
+        self.manager.reactive_events = [
+            {'trigger': 'player.action = take', 'conditions': ['cond1', 'cond2'], 'actions': ['add_flag:taken']},
+        ]
+        self.manager.check_reactive_events('player_action', action='take')
+        self.mock_state_manager.set_flag.assert_called_once_with('taken')
+
+    def test_reactive_conditions_some_false(self):
+        """测试反应事件条件部分为假时不执行动作。"""
+        self.mock_condition_evaluator.compile_condition.side_effect = [lambda: True, lambda: False]
+        self.manager.reactive_events = [
+            {'trigger': 'player.action = take', 'conditions': ['cond1', 'cond2'], 'actions': ['add_flag:taken']},
+        ]
+        self.manager.check_reactive_events('player_action', action='take')
+        self.mock_state_manager.set_flag.assert_not_called()
 
     def test_execute_event_action_spawn_werewolf(self):
         """测试执行事件动作生成狼人。"""
@@ -137,6 +221,14 @@ class TestEventManager:
     def test_execute_event_action_broadcast(self):
         """测试执行事件动作广播。"""
         self.manager._execute_event_action('broadcast:Hello world', {})
+        self.mock_state_manager.add_broadcast_message.assert_called_with('Hello world')
+
+    def test_execute_event_action_unknown(self):
+        """测试未知事件动作不会修改状态。"""
+        self.manager._execute_event_action('unknown:value', {})
+        self.manager._execute_event_action('broadcast', {})
+        self.mock_state_manager.add_broadcast_message.assert_not_called()
+        self.mock_state_manager.set_variable.assert_not_called()
 
     def test_execute_actions_set(self):
         """测试执行动作设置变量。"""
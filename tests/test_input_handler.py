@@ -107,6 +107,18 @@ class TestInputHandler:
         self.mock_event_manager.trigger_player_action.assert_called_with('take', target='sword')
         mock_execute.assert_called_once()
 
+    def test_parse_command_cached(self):
+        """测试相同输入只解析一次，缓存有容量上限。"""
+        self.mock_parser.parse_player_command.side_effect = lambda text: {'action': 'look', 'target': text}
+        first = self.handler._parse_command('look sword')
+        assert self.handler._parse_command('look sword') is first
+        self.mock_parser.parse_player_command.assert_called_once_with('look sword')
+
+        with patch('src.presentation.input.input_handler._PARSE_CACHE_SIZE', 2):
+            self.handler._parse_command('look lamp')
+            self.handler._parse_command('look door')
+        assert list(self.handler._parse_cache) == ['look lamp', 'look door']
+
     def test_process_player_input_exception(self):
         """测试处理输入时发生异常。"""
         self.mock_parser.parse_player_command.return_value = {'action': 'take', 'target': 'sword'}
@@ -123,6 +135,31 @@ class TestInputHandler:
         self.handler.register_action('custom', custom_handler)
         assert 'custom' in self.handler.action_handlers
 
+    def test_action_context_reused(self):
+        """测试动作上下文只构建一次，替换依赖后重新构建。"""
+        context = self.handler._get_action_context()
+        assert context['state'] is self.mock_state_manager
+        assert self.handler._get_action_context() is context
+
+        new_evaluator = Mock()
+        self.handler.condition_evaluator = new_evaluator
+        assert self.handler._get_action_context()['condition_evaluator'] is new_evaluator
+
+        new_executor = Mock()
+        self.handler.action_executor = new_executor
+        assert self.handler._get_action_context()['action_executor'] is new_executor
+
+    def test_action_context_not_cached_with_missing_dependency(self):
+        """测试依赖尚未注册时不缓存上下文，注册后获取到该依赖。"""
+        registered = {'parser', 'state_manager', 'condition_evaluator', 'action_executor', 'plugin_manager'}
+        self.mock_container.has.side_effect = lambda name: name in registered
+        self.handler._interaction_manager = None
+        self.handler._action_context = None
+        assert self.handler._get_action_context()['interaction_manager'] is None
+
+        registered.add('interaction_manager')
+        assert self.handler._get_action_context()['interaction_manager'] is self.mock_interaction_manager
+
     def test_execute_take_no_target(self):
         """测试拿起物品无目标。"""
         result = self.handler._execute_action('take', '')
@@ -205,6 +242,22 @@ class TestInputHandler:
         assert result['success'] is True
         assert result['message'] == 'A shiny sword'
 
+    def test_execute_examine_inventory_only_read_when_needed(self):
+        """测试对象在场景中时不读取库存。"""
+        self.mock_parser.get_object.return_value = {'description': 'A shiny sword'}
+        self.mock_state_manager.get_variable.side_effect = lambda key, default=None: ['sword'] if key == 'inventory' else default
+        with patch.object(self.handler, '_is_object_accessible', return_value=True):
+            assert self.handler._execute_action('examine', 'sword')['success'] is True
+        assert ('inventory', []) not in [call.args for call in self.mock_state_manager.get_variable.call_args_list]
+
+    def test_execute_examine_from_inventory(self):
+        """测试对象不在场景中但在库存中时可以检查。"""
+        self.mock_parser.get_object.return_value = {'description': 'A shiny sword'}
+        self.mock_state_manager.get_current_scene.return_value = None
+        self.mock_state_manager.get_variable.side_effect = lambda key, default=None: ['sword'] if key == 'inventory' else default
+        assert self.handler._execute_action('examine', 'sword')['success'] is True
+        self.mock_state_manager.get_variable.assert_any_call('inventory', [])
+
     def test_execute_attack_no_target(self):
         """测试攻击无目标。"""
         result = self.handler._execute_action('attack', '')
@@ -234,6 +287,21 @@ class TestInputHandler:
         assert '你击中了' in result['message']
         assert len(result['actions']) == 1
         assert 'set:goblin_health=' in result['actions'][0]
+        self.mock_state_manager.mark_changed.assert_called_once_with()
+
+    def test_execute_attack_hit_with_counter(self):
+        """测试命中后反击伤害仍写回玩家状态。"""
+        obj = {'type': 'creature', 'states': [{'value': 30}],
+               'behaviors': {'attack': {'damage': '10', 'counter': '哥布林反击了！', 'counter_damage': 5}}}
+        self.mock_parser.get_object.return_value = obj
+        self.mock_state_manager.get_variable.side_effect = lambda key, default=0: 50 if key == 'health' else default
+        with patch.object(self.handler, '_is_object_accessible', return_value=True):
+            with patch('random.random', return_value=0.3):
+                result = self.handler._execute_action('attack', 'goblin')
+        assert result['success'] is True
+        assert obj['states'][0]['value'] == 20
+        self.mock_state_manager.mark_changed.assert_called_once_with()
+        self.mock_state_manager.set_variable.assert_called_with('health', 45)
 
     def test_execute_search_no_scene(self):
         """测试搜索无场景。"""
@@ -276,6 +344,34 @@ class TestInputHandler:
         assert len(result['actions']) == 1
         assert 'set:inventory=' in result['actions'][0]
 
+    def test_execute_combine_keeps_other_items(self):
+        """测试组合只消耗配方原料，缺少原料时失败。"""
+        self.mock_container.has.side_effect = lambda name: name != 'interaction_manager' and name in [
+            'parser', 'state_manager', 'command_executor', 'event_manager',
+            'condition_evaluator', 'action_executor'
+        ]
+        self.mock_state_manager.get_variable.side_effect = lambda *args, **kwargs: ['herb', 'sword', 'bottle']
+        result = self.handler._execute_action('combine', 'herb_potion')
+        assert result['actions'] == ["set:inventory=['sword', 'herb_potion']"]
+        assert self.handler.combine_recipe_sets == {'herb_potion': frozenset({'herb', 'bottle'})}
+
+        self.mock_state_manager.get_variable.side_effect = lambda *args, **kwargs: ['herb']
+        result = self.handler._execute_action('combine', 'herb_potion')
+        assert result['success'] is False
+
+    def test_script_command_target_description_cached(self):
+        """测试脚本命令的目标描述通过对象缓存获取。"""
+        self.mock_parser.get_command.return_value = {'actions': []}
+        self.mock_parser.get_object.return_value = {'description': '一把锋利的剑'}
+        self.mock_command_executor.execute_command.return_value = []
+        player_command = {'parameters': {'message': '{target_description}'}}
+
+        self.handler._execute_script_command('show', player_command, 'sword')
+        self.handler._execute_script_command('show', player_command, 'sword')
+
+        self.mock_command_executor.execute_command.assert_called_with({'show': '一把锋利的剑'})
+        self.mock_parser.get_object.assert_called_once_with('sword')
+
     def test_is_object_accessible_no_scene(self):
         """测试对象可访问性无场景。"""
         self.mock_state_manager.get_current_scene.return_value = None
@@ -288,6 +384,16 @@ class TestInputHandler:
         self.mock_state_manager.get_current_scene.return_value = 'village'
         assert self.handler._is_object_accessible('sword')
 
+    def test_is_object_accessible_caches_scene_objects(self):
+        """测试场景对象ID集合只构建一次，支持字符串和引用两种写法。"""
+        self.mock_parser.get_scene.return_value = {'objects': ['lamp', {'ref': 'sword'}]}
+        self.mock_state_manager.get_current_scene.return_value = 'village'
+        assert self.handler._is_object_accessible('lamp')
+        assert self.handler._is_object_accessible('sword')
+        assert not self.handler._is_object_accessible('shield')
+        assert self.handler._scene_object_ids['village'] == {'lamp', 'sword'}
+        self.mock_parser.get_scene.assert_called_once_with('village')
+
     def test_remove_object_from_scene(self):
         """测试从场景中移除对象。"""
         self.mock_state_manager.get_current_scene.return_value = 'village'
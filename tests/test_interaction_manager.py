@@ -0,0 +1,54 @@
+"""
+Unit tests for InteractionManager.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+from src.domain.runtime.interaction_manager import InteractionManager
+
+
+class TestInteractionManager:
+    def setup_method(self):
+        """设置测试方法。"""
+        self.mock_parser = Mock()
+        self.mock_state_manager = Mock()
+        self.mock_condition_evaluator = Mock()
+        self.manager = InteractionManager(
+            self.mock_parser,
+            self.mock_state_manager,
+            self.mock_condition_evaluator
+        )
+        self.attributes = {'strength': 15, 'agility': 5}
+        self.mock_state_manager.get_variable.side_effect = lambda name, default=None: self.attributes.get(name, default)
+
+    def test_execute_physics_interaction_applies_modifiers(self):
+        """测试物理互动按简单乘数和阈值修改器计算成功几率。"""
+        self.manager.interaction_data = {'physics': {'push': {
+            'base_chance': 0.2,
+            'modifiers': {'strength': '0.1 per point above 10', 'agility': '0'},
+            'success': '推开了',
+            'failure': '推不动',
+        }}}
+        # 0.2 + (15 - 10) * 0.1 + 5 * 0 = 0.7
+        with patch('random.random', return_value=0.69):
+            assert self.manager.execute_physics_interaction('push')['success'] is True
+        with patch('random.random', return_value=0.71):
+            assert self.manager.execute_physics_interaction('push')['success'] is False
+
+    def test_physics_modifiers_compiled_once(self):
+        """测试修改器只解析一次，互动数据被替换后重新解析。"""
+        self.manager.interaction_data = {'physics': {'push': {
+            'modifiers': {'strength': '0.1 per point above 20', 'agility': 'bogus.value'},
+        }}}
+        with patch('random.random', return_value=0.0):
+            self.manager.execute_physics_interaction('push')
+        compiled = self.manager._compiled_modifiers['push']
+        assert compiled == [('strength', 20, 0.1)]
+        with patch('random.random', return_value=0.0):
+            self.manager.execute_physics_interaction('push')
+        assert self.manager._compiled_modifiers['push'] is compiled
+
+        self.manager.interaction_data = {'physics': {'push': {'modifiers': {'strength': '2'}}}}
+        with patch('random.random', return_value=0.0):
+            self.manager.execute_physics_interaction('push')
+        assert self.manager._compiled_modifiers['push'] == [('strength', None, 2.0)]
@@ -54,6 +54,127 @@ class TestScriptParser:
         finally:
             os.unlink(script_file)
 
+    def test_load_script_interns_keys(self):
+        """测试加载脚本后字典键被驻留且保持顺序。"""
+        script_content = {
+            'scenes': {
+                'start': {'text': 'Start', 'actions': [{'greet_player': 'hi'}]},
+                'end': {'text': 'End'}
+            },
+            'commands': {'greet_player': {'actions': ['message']}},
+            'start_scene': 'start'
+        }
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            yaml.dump(script_content, f, sort_keys=False)
+            script_file = f.name
+
+        try:
+            parser = ScriptParser()
+            parser.load_script(script_file)
+            command_key = next(iter(parser.script_data['commands']))
+            action_key = next(iter(parser.script_data['scenes']['start']['actions'][0]))
+            assert command_key is action_key
+            assert list(parser.script_data['scenes']) == ['start', 'end']
+        finally:
+            os.unlink(script_file)
+
+    def test_load_script_cached_data_not_shared(self):
+        """测试重复加载同一脚本时不共享已解析的数据。"""
+        script_content = {
+            'scenes': {
+                'start': {'text': 'Welcome to the game!'}
+            }
+        }
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            yaml.dump(script_content, f)
+            script_file = f.name
+
+        try:
+            first = ScriptParser()
+            first.load_script(script_file)
+            first.script_data['scenes']['start']['text'] = 'Changed'
+
+            second = ScriptParser()
+            second.load_script(script_file)
+            assert second.script_data == script_content
+        finally:
+            os.unlink(script_file)
+
+    def test_load_multi_document_include(self):
+        """测试包含文件为多文档YAML流时合并所有文档。"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            include_file = os.path.join(tmp_dir, 'fragments.yaml')
+            with open(include_file, 'w', encoding='utf-8') as f:
+                yaml.dump_all([
+                    {'scenes': {'room1': {'text': 'Room 1'}}},
+                    {'scenes': {'room2': {'text': 'Room 2'}}, 'start_scene': 'room2'},
+                ], f)
+
+            script_file = os.path.join(tmp_dir, 'main.yaml')
+            with open(script_file, 'w', encoding='utf-8') as f:
+                yaml.dump({
+                    'includes': ['fragments.yaml'],
+                    'scenes': {'start': {'text': 'Start'}},
+                    'start_scene': 'start'
+                }, f)
+
+            parser = ScriptParser()
+            parser.load_script(script_file)
+            assert set(parser.script_data['scenes']) == {'start', 'room1', 'room2'}
+            assert parser.get_start_scene() == 'start'
+
+    def test_multiple_includes_precedence(self):
+        """测试多个包含文件合并时主脚本优先，其次是靠前的包含文件。"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fragments = {
+                'a.yaml': {'scenes': {'room': {'text': 'A'}, 'hall': {'text': 'Hall'}}},
+                'b.yaml': {'scenes': {'room': {'text': 'B', 'choices': []}, 'cellar': {'text': 'Cellar'}}},
+            }
+            for name, content in fragments.items():
+                with open(os.path.join(tmp_dir, name), 'w', encoding='utf-8') as f:
+                    yaml.dump(content, f)
+
+            script_file = os.path.join(tmp_dir, 'main.yaml')
+            with open(script_file, 'w', encoding='utf-8') as f:
+                yaml.dump({
+                    'includes': ['a.yaml', 'b.yaml'],
+                    'scenes': {'start': {'text': 'Start'}, 'hall': {'text': 'Main Hall'}},
+                    'start_scene': 'start'
+                }, f)
+
+            parser = ScriptParser()
+            parser.load_script(script_file)
+            scenes = parser.script_data['scenes']
+            assert set(scenes) == {'start', 'hall', 'room', 'cellar'}
+            assert scenes['hall']['text'] == 'Main Hall'
+            assert scenes['room'] == {'text': 'A', 'choices': []}
+
+    def test_includes_merge_into_script_in_order(self):
+        """测试每个包含文件按顺序直接合入脚本，靠前包含文件中的冲突标量不会遮蔽后续字典。"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fragments = {
+                'a.yaml': {'settings': 'plain'},
+                'b.yaml': {'settings': {'volume': 5}},
+            }
+            for name, content in fragments.items():
+                with open(os.path.join(tmp_dir, name), 'w', encoding='utf-8') as f:
+                    yaml.dump(content, f)
+
+            script_file = os.path.join(tmp_dir, 'main.yaml')
+            with open(script_file, 'w', encoding='utf-8') as f:
+                yaml.dump({
+                    'includes': ['a.yaml', 'b.yaml'],
+                    'scenes': {'start': {'text': 'Start'}},
+                    'settings': {'difficulty': 'easy'},
+                    'start_scene': 'start'
+                }, f)
+
+            parser = ScriptParser()
+            parser.load_script(script_file)
+            assert parser.script_data['settings'] == {'difficulty': 'easy', 'volume': 5}
+
     def test_load_dsl_script(self):
         """测试加载DSL格式脚本。"""
         script_content = {
@@ -216,6 +337,39 @@ class TestScriptParser:
         finally:
             os.unlink(script_file)
 
+    def test_scene_object_and_state_indexes(self):
+        """测试场景对象和对象状态索引。"""
+        script_content = {
+            'game': {'title': 'Test'},
+            'world': {'start': 'hall'},
+            'define_object': {
+                'door': {'type': 'object', 'states': [{'name': 'open', 'value': False}]}
+            },
+            'scenes': {
+                'hall': {'text': 'A hall', 'objects': [{'ref': 'door'}, 'rug']}
+            }
+        }
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            yaml.dump(script_content, f)
+            script_file = f.name
+
+        try:
+            parser = ScriptParser()
+            parser.load_script(script_file)
+            assert parser.get_scene_object_entries('hall', 'door') == [{'ref': 'door'}]
+            assert parser.get_scene_object_entries('hall', 'rug') == []
+            assert parser.get_scene_object_entries('missing', 'door') == []
+
+            state = parser.get_object_state('door', 'open')
+            assert state == {'name': 'open', 'value': False}
+            # 索引返回原始状态条目，运行时修改可见
+            parser.get_object('door')['states'][0]['value'] = True
+            assert parser.get_object_state('door', 'open')['value'] is True
+            assert parser.get_object_state('door', 'locked') is None
+        finally:
+            os.unlink(script_file)
+
     def test_parse_player_command_with_config(self):
         """测试带配置的玩家命令解析。"""
         script_content = {
@@ -35,6 +35,36 @@ class TestStateManager:
         assert manager.get_variable('is_alive') is True
         assert manager.get_variable('score') == 42.5
 
+    def test_update_variables(self):
+        """测试批量设置变量。"""
+        manager = StateManager()
+        manager.set_variable('health', 100)
+
+        manager.update_variables({'health': 80, 'gold': 5})
+
+        assert manager.get_variable('health') == 80
+        assert manager.get_variable('gold') == 5
+
+    def test_revision_increments_on_mutation(self):
+        """测试状态变化时版本号递增。"""
+        manager = StateManager()
+        revision = manager.revision
+
+        manager.set_variable('health', 100)
+        assert manager.revision > revision
+        revision = manager.revision
+
+        manager.set_flag('has_key')
+        assert manager.revision > revision
+        revision = manager.revision
+
+        manager.get_variable('health')
+        manager.has_flag('has_key')
+        assert manager.revision == revision
+
+        manager.mark_changed()
+        assert manager.revision > revision
+
     def test_flag_operations(self):
         """测试标志操作。"""
         manager = StateManager()
@@ -155,3 +185,16 @@ class TestStateManager:
         assert manager.flags == set()
         assert manager.current_scene == ""
         assert manager.active_effects == {}
+
+    def test_broadcast_messages_drained(self):
+        """测试获取广播消息后队列被清空，且返回值不受后续消息影响。"""
+        manager = StateManager()
+        manager.add_broadcast_message('first')
+        manager.add_broadcast_message('second')
+
+        messages = manager.get_broadcast_messages()
+        manager.add_broadcast_message('third')
+
+        assert messages == ['first', 'second']
+        assert manager.get_broadcast_messages() == ['third']
+        assert manager.get_broadcast_messages() == []